@@ -0,0 +1,119 @@
+"""
+JSON codec benchmark on payloads shaped like the client's hot paths:
+a large /embeddings response, an SSE chat stream relayed chunk by chunk,
+and a chat request body.
+
+    python benchmarks/bench_json.py [--repeat N] > bench_output.txt
+"""
+
+import argparse
+import random
+import time
+
+from ml_api_client.modules.serialization import available_codecs, get_codec
+
+
+def embeddings_response(rows: int = 64, dim: int = 1536) -> dict:
+    rng = random.Random(0)
+    return {
+        "object": "list",
+        "model": "text-embedding-3-small",
+        "data": [
+            {
+                "object": "embedding",
+                "index": i,
+                "embedding": [rng.uniform(-1, 1) for _ in range(dim)],
+            }
+            for i in range(rows)
+        ],
+        "usage": {"prompt_tokens": rows * 40, "total_tokens": rows * 40},
+    }
+
+
+def chat_chunks(count: int = 500) -> list:
+    return [
+        {
+            "id": "chatcmpl-123",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "gpt-4o-mini",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": f" token{i} é"},
+                    "finish_reason": None,
+                }
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def chat_request(messages: int = 20) -> dict:
+    return {
+        "model": "gpt-4o-mini",
+        "stream": True,
+        "messages": [
+            {"role": "user" if i % 2 else "assistant", "content": "lorem ipsum " * 80}
+            for i in range(messages)
+        ],
+        "tools": [
+            {
+                "type": "function",
+                "function": {
+                    "name": f"tool_{i}",
+                    "description": "Does something useful.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {"query": {"type": "string"}},
+                        "required": ["query"],
+                    },
+                },
+            }
+            for i in range(8)
+        ],
+    }
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    reference = get_codec("json")
+    embeddings = reference.dumps(embeddings_response())
+    chunks = [reference.dumps(c) for c in chat_chunks()]
+    request = chat_request()
+
+    cases = {
+        f"decode /embeddings response ({len(embeddings) // 1024} KiB)": lambda c: (
+            lambda: c.loads(embeddings)
+        ),
+        f"SSE relay: decode + re-encode {len(chunks)} chunks": lambda c: (
+            lambda: [c.dumps(c.loads(chunk)) for chunk in chunks]
+        ),
+        "encode chat request body (x100)": lambda c: (
+            lambda: [c.dumps(request) for _ in range(100)]
+        ),
+    }
+
+    codecs = available_codecs()
+    print(f"{'case':<48}" + "".join(f"{name:>12}" for name in codecs) + "   speedup")
+    for label, make in cases.items():
+        timings = [best_of(make(get_codec(name)), args.repeat) for name in codecs]
+        baseline = timings[codecs.index("json")]
+        cells = "".join(f"{t * 1000:>10.2f}ms" for t in timings)
+        print(f"{label:<48}{cells}   x{baseline / min(timings):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,27 @@
 from .api_client import APIClient
+from .exceptions import APIError, CircuitOpenError
+from .modules.circuit_breaker import CircuitBreakerConfig
+from .modules.connection import ConnectorConfig, PoolStats
+from .modules.embedding_cache import EmbeddingCache
+from .modules.hedging import HedgeConfig
+from .modules.rate_limit import RateLimit
+from .modules.retry import RetryBudget, RetryPolicy
+from .modules.serialization import JSONCodec
+from .modules.tools import ToolCachePolicy, ToolExecutorConfig
 
-__all__ = ["APIClient"]
+__all__ = [
+    "APIClient",
+    "APIError",
+    "CircuitBreakerConfig",
+    "CircuitOpenError",
+    "ConnectorConfig",
+    "EmbeddingCache",
+    "HedgeConfig",
+    "JSONCodec",
+    "PoolStats",
+    "RateLimit",
+    "RetryBudget",
+    "RetryPolicy",
+    "ToolCachePolicy",
+    "ToolExecutorConfig",
+]
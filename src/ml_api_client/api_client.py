@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Any, Dict, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 import aiohttp
 from aiohttp import ClientTimeout
@@ -12,7 +14,29 @@ from .endpoints import (
     ModelsEndpoint,
     VectorStoresEndpoint,
 )
+from .exceptions import APIError, CircuitOpenError
+from .utils import route_family
+from ml_api_client.modules.circuit_breaker import (
+    CircuitBreakerConfig,
+    CircuitBreakers,
+)
+from ml_api_client.modules.connection import (
+    ConnectorConfig,
+    PoolStats,
+    SharedConnectorPool,
+)
+from ml_api_client.modules.hedging import HedgeConfig, Hedger
+from ml_api_client.modules.instrumentation import Instrumentation, RequestTrace
+from ml_api_client.modules.rate_limit import (
+    AdmissionController,
+    RateLimit,
+    estimate_tokens,
+)
+from ml_api_client.modules.retry import RetryPolicy, RetryState
+from ml_api_client.modules.serialization import JSONCodec, get_codec
+from ml_api_client.modules.token_refresher import TokenRefresher
 from ml_api_client.modules.tools import ToolRegistry
+from ml_api_client.modules.usage import UsageTracker
 
 # Configure logging once with all settings
 logging.basicConfig(
@@ -33,6 +57,15 @@ class APIClient:
         timeout: int = 60,
         max_retries: int = 3,
         retry_delay: float = 0.5,
+        connector_config: Optional[ConnectorConfig] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        share_connector: bool = False,
+        max_in_flight: Optional[int] = None,
+        rate_limits: Optional[Dict[str, RateLimit]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreakerConfig] = None,
+        hedging: Optional[HedgeConfig] = None,
+        json_codec: Union[None, str, JSONCodec] = None,
     ):
         self.base_url = base_url
         self.api_key = api_key
@@ -42,7 +75,39 @@ class APIClient:
         self.timeout = ClientTimeout(total=timeout)
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.retry_count = 0
+        # Renouvellement du token : un seul login en vol, anticipé avant expiration
+        self.token_refresher = TokenRefresher(self)
+        # Contrôle d'admission : requêtes en vol, débit et tokens par famille d'endpoints
+        self.admission = AdmissionController(max_in_flight, rate_limits)
+        # Sérialisation JSON (orjson / msgspec si installés, sinon json)
+        self.json_codec = get_codec(json_codec)
+        # Comptabilité des tokens (chat, embeddings) par modèle, tag et itération
+        self.usage = UsageTracker()
+        # Événements d'instrumentation (phases, retries, flux) ; aucun coût sans écouteur
+        self.events = Instrumentation()
+        # Disjoncteurs par hôte et famille d'endpoints (désactivés par défaut)
+        self.circuit_breakers = (
+            CircuitBreakers(circuit_breaker) if circuit_breaker is not None else None
+        )
+        if self.circuit_breakers is not None:
+            self.circuit_breakers.add_listener(
+                lambda name, old, new: self.events.emit(
+                    "circuit_state", breaker=name, old=old, new=new
+                )
+            )
+        # Requêtes couvertes (hedging) des routes idempotentes (désactivées par défaut)
+        self.hedger = Hedger(hedging) if hedging is not None else None
+        # Politique de retry unique (statuts, exceptions, jitter, échéance, budget)
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=max_retries + 1, base_delay=retry_delay
+        )
+
+        # Pool de connexions : un connecteur fourni par l'appelant n'est jamais fermé
+        # par le client ; sinon il est créé (ou partagé) à l'ouverture de la session.
+        self.connector_config = connector_config or ConnectorConfig()
+        self.share_connector = share_connector
+        self._connector: Optional[aiohttp.BaseConnector] = connector
+        self._owns_connector = connector is None
 
         # La session est initialisée dans __aenter__ pour la gestion du contexte asynchrone
         self.session = None
@@ -61,7 +126,41 @@ class APIClient:
         """Ferme la session cliente si elle existe."""
         if self.session and not self.session.closed:
             await self.session.close()
-            self.session = None
+        self.session = None
+        if self.share_connector and self._owns_connector and self._connector:
+            await SharedConnectorPool.release(self._connector)
+        if self._owns_connector:
+            self._connector = None
+        self.tools.shutdown()
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Crée la session (et son connecteur) si nécessaire."""
+        if self.session and not self.session.closed:
+            return self.session
+
+        if self._owns_connector and (self._connector is None or self._connector.closed):
+            if self.share_connector:
+                self._connector = SharedConnectorPool.acquire(self.connector_config)
+            else:
+                self._connector = self.connector_config.build()
+
+        self.session = aiohttp.ClientSession(
+            timeout=self.timeout,
+            connector=self._connector,
+            # Un connecteur partagé ou fourni survit à la session
+            connector_owner=self._owns_connector and not self.share_connector,
+            # Phases de connexion (file du pool, DNS, TCP/TLS, TTFB) des requêtes tracées
+            trace_configs=[self.events.trace_config()],
+        )
+        return self.session
+
+    def pool_stats(self) -> PoolStats:
+        """Retourne l'état du pool de connexions (en cours, inactives, en attente)."""
+        return PoolStats.from_connector(self._connector)
+
+    def breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retourne l'état et les compteurs de chaque disjoncteur."""
+        return self.circuit_breakers.stats() if self.circuit_breakers else {}
 
     async def _prepare_headers(self) -> Dict[str, str]:
         """Prépare les en-têtes pour la requête, avec authentification si disponible."""
@@ -73,69 +172,237 @@ class APIClient:
         return headers
 
     async def _request(
-        self, method: str, url: str, retry: bool = True, **kwargs
+        self, method: str, url: str, retry: bool = True, hedge: bool = False, **kwargs
     ) -> Dict[str, Any]:
-        """Effectue une requête HTTP avec retry automatique en cas d'échec d'authentification."""
-        if not self.session or self.session.closed:
-            self.session = aiohttp.ClientSession(timeout=self.timeout)
+        """
+        Effectue une requête HTTP avec retry automatique en cas d'échec d'authentification.
+        `hedge=True` (routes idempotentes uniquement) active les requêtes couvertes
+        si le client a été créé avec `hedging` ; la requête est alors aussi rejouable.
+        """
+        if hedge:
+            kwargs.setdefault("idempotent", True)
 
-        headers = await self._prepare_headers()
-        headers.update(kwargs.pop("headers", {}))
+        async def call() -> Dict[str, Any]:
+            if not self.events.enabled:
+                async with self._open(method, url, retry=retry, **kwargs) as response:
+                    return self._decode(await response.read())
 
-        try:
-            async with self.session.request(
-                method, url, headers=headers, **kwargs
+            trace = RequestTrace(method, url, route_family(url))
+            async with self._open(
+                method, url, retry=retry, trace=trace, **kwargs
             ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                # Réinitialisation du compteur après une requête réussie
-                self.retry_count = 0
-                return result
-
-        except aiohttp.ClientResponseError as e:
-            if e.status == 401 and retry and self.retry_count < self.max_retries:
-                self.retry_count += 1
-                self.auth_token = None
-                self.logger.info(
-                    f"Token expiré, nouvelle tentative d'authentification ({self.retry_count}/{self.max_retries})..."
+                trace.mark("body_read")
+                body = await response.read()
+                trace.close("body_read")
+                trace.mark("json_decode")
+                data = self._decode(body)
+                trace.close("json_decode")
+                return data
+
+        if hedge and self.hedger is not None:
+            return await self.hedger.run(f"{method} {route_family(url)}", call)
+        return await call()
+
+    @asynccontextmanager
+    async def _open(
+        self,
+        method: str,
+        url: str,
+        retry: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        trace: Optional[RequestTrace] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Ouvre une requête HTTP sur la session partagée et fournit la réponse validée.
+        Le corps n'est pas lu, ce qui permet aussi de consommer un flux (SSE).
+        Les statuts et erreurs transitoires sont rejoués selon la politique de retry
+        du client (ou `retry_policy`), tant que la réponse n'a pas été fournie.
+        Une écriture (méthode hors `idempotent_methods`) n'est rejouée qu'après un
+        429, sauf si l'appel la déclare `idempotent=True`.
+        """
+        session = self._ensure_session()
+        extra_headers = kwargs.pop("headers", {})
+        family = route_family(url)
+        body = kwargs.pop("json", None)
+        tokens = estimate_tokens(body) if self.admission.charges_tokens(family) else 0.0
+        if body is not None:
+            # Encodé une seule fois, réutilisé tel quel par les nouvelles tentatives
+            kwargs["data"] = self.json_codec.dumps_body(body)
+            extra_headers = {"Content-Type": "application/json", **extra_headers}
+        # Budgets de retry propres à la requête ; le budget global est partagé
+        policy = retry_policy or self.retry_policy
+        if idempotent is None:
+            idempotent = method.upper() in policy.idempotent_methods
+        state = policy.begin(idempotent)
+        auth_attempt = 0
+        breaker = self.circuit_breakers.for_url(url) if self.circuit_breakers else None
+        if trace is None and self.events.enabled:
+            trace = RequestTrace(method, url, family)
+
+        while True:
+            if retry:
+                await self.token_refresher.ensure_fresh()
+            # Les en-têtes d'authentification sont recalculés à chaque tentative :
+            # une rotation de token s'applique sans recréer la session.
+            token = self.auth_token
+            headers = await self._prepare_headers()
+            headers.update(extra_headers)
+            # Disjoncteur ouvert : échec immédiat, sans attendre le timeout
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit ouvert pour '{breaker.name}'",
+                    retry_after=breaker.retry_after(),
                 )
-                await asyncio.sleep(self.retry_delay * self.retry_count)
-                if self.username and self.password:
-                    await self.auth.login(
-                        username=self.username, password=self.password, expires_in=1
-                    )
-                    return await self._request(method, url, retry=True, **kwargs)
-                else:
-                    raise PermissionError(
-                        "Clé API ou token d'authentification invalide."
-                    )
-            elif e.status == 403:
-                raise PermissionError(f"Accès interdit : {e.message}")
-            elif e.status == 404:
-                raise ValueError(f"Ressource introuvable : {e.message}")
-            else:
-                raise APIError(
-                    f"Erreur HTTP : {e.status} - {e.message}", status_code=e.status
+            if trace is not None:
+                trace.begin_attempt()
+                trace.mark("queue_wait")
+            # Contrôle d'admission : le créneau est tenu jusqu'à la fin de la lecture
+            try:
+                release = await self.admission.acquire(family, tokens)
+            except BaseException:
+                if breaker is not None:
+                    breaker.abandon()
+                raise
+            if trace is not None:
+                trace.close("queue_wait")
+            started = time.monotonic()
+            try:
+                response = await session.request(
+                    method, url, headers=headers, trace_request_ctx=trace, **kwargs
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                release()
+                if breaker is not None:
+                    breaker.record(True, time.monotonic() - started)
+                error = self._map_transport_error(e, url)
+                self._end_attempt(trace, error=str(error))
+                if not state.should_retry_exception(error):
+                    raise error from e
+                await self._backoff(state, family, error)
+                continue
+            except BaseException:
+                release()
+                if breaker is not None:
+                    breaker.abandon()
+                raise
+
+            if breaker is not None:
+                breaker.record(response.status >= 500, time.monotonic() - started)
+            try:
+                paused = self.admission.observe(
+                    family, response.status, response.headers
                 )
-        except aiohttp.ClientConnectionError as e:
-            raise ConnectionError(f"Erreur de connexion : {str(e)}")
-        except asyncio.TimeoutError:
-            raise TimeoutError(f"Délai dépassé pour la requête : {url}")
+
+                if response.status == 401 and retry and auth_attempt < self.max_retries:
+                    if not self.token_refresher.can_refresh:
+                        raise PermissionError(
+                            "Clé API ou token d'authentification invalide."
+                        )
+                    auth_attempt += 1
+                    self.logger.info(
+                        f"Token expiré, nouvelle tentative d'authentification ({auth_attempt}/{self.max_retries})..."
+                    )
+                    # Libère le créneau : le login doit pouvoir être admis
+                    response.release()
+                    release()
+                    self._end_attempt(trace, status=response.status)
+                    if auth_attempt > 1:
+                        await asyncio.sleep(self.retry_delay * (auth_attempt - 1))
+                    # Un seul login en vol, partagé par toutes les requêtes en 401
+                    await self.token_refresher.refresh(token)
+                    continue
+
+                if not response.ok and state.should_retry_status(response.status):
+                    response.release()
+                    release()
+                    self._end_attempt(trace, status=response.status)
+                    if paused:
+                        # La pause (Retry-After / x-ratelimit-reset-*) est déjà
+                        # appliquée par le contrôleur d'admission : pas de backoff
+                        # en plus, les deux délais ne se cumulent pas.
+                        self.logger.warning(
+                            f"HTTP {response.status} sur '{family}', nouvelle tentative ({state.attempts}/{state.policy.max_attempts}) dans {paused:.2f}s..."
+                        )
+                        self.events.emit(
+                            "retry",
+                            family=family,
+                            attempt=state.attempts,
+                            delay=paused,
+                            reason=f"HTTP {response.status}",
+                        )
+                    else:
+                        await self._backoff(state, family, f"HTTP {response.status}")
+                    continue
+
+                self._raise_for_status(response)
+                try:
+                    yield response
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    raise self._map_transport_error(e, url) from e
+                return
+            finally:
+                response.release()
+                release()
+                self._end_attempt(trace, status=response.status)
+
+    def _decode(self, body: bytes) -> Any:
+        """Décode un corps JSON (None si vide, comme aiohttp)."""
+        if not body.strip():
+            return None
+        return self.json_codec.loads(body)
+
+    def _end_attempt(self, trace: Optional[RequestTrace], **extra: Any) -> None:
+        """Émet l'événement "request" de la tentative en cours (une seule fois)."""
+        if trace is not None:
+            attributes = trace.finish(**extra)
+            if attributes is not None:
+                self.events.emit("request", **attributes)
+
+    async def _backoff(self, state: RetryState, family: str, reason: Any) -> None:
+        """Attend avant la prochaine tentative (jitter décorrélé)."""
+        delay = state.next_delay()
+        self.logger.warning(
+            f"Échec transitoire sur '{family}' ({reason}), nouvelle tentative "
+            f"({state.attempts}/{state.policy.max_attempts}) dans {delay:.2f}s..."
+        )
+        self.events.emit(
+            "retry",
+            family=family,
+            attempt=state.attempts,
+            delay=delay,
+            reason=str(reason),
+        )
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _map_transport_error(error: BaseException, url: str) -> Exception:
+        """Convertit les erreurs aiohttp en ConnectionError / TimeoutError."""
+        if isinstance(error, asyncio.TimeoutError):
+            return TimeoutError(f"Délai dépassé pour la requête : {url}")
+        return ConnectionError(f"Erreur de connexion : {str(error)}")
+
+    @staticmethod
+    def _raise_for_status(response: aiohttp.ClientResponse) -> None:
+        """Convertit les statuts HTTP en erreur en exceptions du client."""
+        if response.ok:
+            return
+        message = response.reason
+        if response.status == 403:
+            raise PermissionError(f"Accès interdit : {message}")
+        if response.status == 404:
+            raise ValueError(f"Ressource introuvable : {message}")
+        raise APIError(
+            f"Erreur HTTP : {response.status} - {message}",
+            status_code=response.status,
+        )
 
     async def __aenter__(self):
         """Initialise la session lors de l'entrée dans le contexte asynchrone."""
-        if not self.session or self.session.closed:
-            self.session = aiohttp.ClientSession(timeout=self.timeout)
+        self._ensure_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Assure le nettoyage des ressources."""
         await self.close()
-
-
-class APIError(Exception):
-    """Exception personnalisée pour les erreurs d'API."""
-
-    def __init__(self, message: str, status_code: Optional[int] = None):
-        self.status_code = status_code
-        super().__init__(message)
@@ -29,9 +29,11 @@ class AuthEndpoint:
 
         # OAuth2 password flow uses form-encoded body
         data = {"username": username, "password": password, "expires_in": expires_in}
-        response = await self.client._request("POST", url, data=data)
+        # retry=False: the login call itself must not trigger a token refresh
+        response = await self.client._request("POST", url, data=data, retry=False)
         # Stocker le jeton d'authentification dans l'instance de APIClient
         self.client.auth_token = response["access_token"]
+        self.client.token_refresher.record(response)
         return response
 
     async def generate_api_key(
@@ -1,11 +1,11 @@
 import asyncio
-import inspect
-import json
-import random
+import functools
+import time
 import warnings
 from typing import (
     Any,
     AsyncGenerator,
+    Callable,
     Dict,
     Iterable,
     Optional,
@@ -15,104 +15,267 @@ from typing import (
     Awaitable,
 )
 
-from openai import AsyncOpenAI
-from openai import APIConnectionError, RateLimitError
-from openai._exceptions import APIStatusError  # status_code available
+import aiohttp
 from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
+from ..exceptions import APIError
+from ..modules.instrumentation import StreamTrace
+from ..modules.retry import RetryPolicy
+from ..modules.serialization import JSONFragment, JSONStreamBuffer
+from ..utils import iter_sse_data, iter_sse_frames, sse_frame_data
+
+
+def _release_from_worker(
+    loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore
+) -> None:
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:  # the loop is already closed
+        pass
+
+
+def _first_delta(choices: Any, obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # shape check of a decoded chunk, so malformed frames fail loudly
+    if not isinstance(choices, list) or not isinstance(choices[0], dict):
+        raise APIError(f"Malformed stream chunk: {obj!r:.200}")
+    delta = choices[0].get("delta")
+    if delta is not None and not isinstance(delta, dict):
+        raise APIError(f"Malformed stream chunk: {obj!r:.200}")
+    return delta
+
 
 class ChatEndpoint:
     def __init__(self, client):
         self.client = client
-        self.max_stream_retries = 3
-        self.retry_delay_base = 1.0
-        self._sdk: Optional[AsyncOpenAI] = None
+        # Overrides client.retry_policy for chat calls when set
+        self.retry_policy: Optional[RetryPolicy] = None
+        # ask for the final usage chunk on streams (stream_options.include_usage)
+        # to fill client.usage; that choice-less chunk is not passed on unless
+        # the caller set stream_options itself
+        self.include_usage = True
         self.tools = client.tools
 
         # tool loop safety
         self.max_tool_iterations = 5
 
     # --------------------------
-    # SDK bootstrap
+    # Transport (shared aiohttp session of the client)
     # --------------------------
-    def _ensure_sdk(self) -> AsyncOpenAI:
-        if self._sdk:
-            return self._sdk
-
-        timeout_s = getattr(self.client.timeout, "total", None)
-        default_headers: Dict[str, str] = {}
-
-        api_key_for_sdk = self.client.auth_token or (self.client.api_key or "none")
-        if self.client.api_key:
-            default_headers["X-ML-API-Key"] = self.client.api_key
-
-        self._sdk = AsyncOpenAI(
-            base_url=self.client.base_url,
-            api_key=api_key_for_sdk,
-            max_retries=self.client.max_retries,
-            timeout=timeout_s if timeout_s is not None else 60,
-            default_headers=default_headers or None,
+    @property
+    def _url(self) -> str:
+        return f"{self.client.base_url}/chat/completions"
+
+    def _payload(
+        self,
+        model: str,
+        messages: Iterable[ChatCompletionMessageParam],
+        stream: bool,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": list(messages),
+            "stream": stream,
+            **kwargs,
+        }
+        # tool_choice is rejected upstream when no tools are sent
+        if tools:
+            payload["tools"] = tools
+            if tool_choice is not None:
+                payload["tool_choice"] = tool_choice
+        return payload
+
+    def _stream_timeout(self) -> aiohttp.ClientTimeout:
+        # A stream may legitimately outlive the total timeout: bound the gap
+        # between two reads instead.
+        return aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=self.client.timeout.total,
+            sock_read=self.client.timeout.total,
+        )
+
+    async def _create(
+        self, payload: Dict[str, Any], idempotent: bool = True
+    ) -> ChatCompletion:
+        data = await self.client._request(
+            "POST",
+            self._url,
+            json=payload,
+            retry_policy=self.retry_policy,
+            idempotent=idempotent,
         )
-        return self._sdk
+        events = self.client.events
+        if not events.enabled:
+            return ChatCompletion.construct(**data)
+        started = time.perf_counter()
+        completion = ChatCompletion.construct(**data)
+        # construct() skips validation: this only times building the model
+        events.emit(
+            "construct",
+            family="chat",
+            model="ChatCompletion",
+            duration=time.perf_counter() - started,
+        )
+        return completion
+
+    def _decode_frame(self, data: bytes) -> Dict[str, Any]:
+        try:
+            obj = self.client.json_codec.loads(data)
+        except Exception as e:
+            raise APIError(f"Malformed stream frame: {data[:200]!r}") from e
+        if not isinstance(obj, dict):
+            raise APIError(f"Malformed stream frame: {data[:200]!r}")
+        if obj.get("error"):
+            err = obj["error"]
+            message = err.get("message") if isinstance(err, dict) else str(err)
+            raise APIError(f"Stream error: {message}")
+        return obj
 
     # --------------------------
     # Helpers: tool execution
     # --------------------------
-    async def _maybe_call_tool(
-        self, name: str, arguments: Union[str, Dict[str, Any]]
-    ) -> Any:
+    def _tool_args(
+        self, name: str, arguments: Union[str, Dict[str, Any], None]
+    ) -> Dict[str, Any]:
+        """
+        Decodes and validates the arguments of a tool call. Raises ValueError
+        with a message meant to be sent back to the model as the tool result.
+        """
+        if not self.tools.has(name):
+            raise ValueError(f"Unknown tool '{name}'")
         if isinstance(arguments, str) and arguments.strip():
             try:
-                args = json.loads(arguments)
-            except Exception:
-                # try forgiving parse (e.g., partial JSON)
-                args = {}
+                args = self.client.json_codec.loads(arguments)
+            except Exception as e:
+                raise ValueError(f"Invalid JSON arguments for tool '{name}': {e}")
         elif isinstance(arguments, dict):
             args = arguments
         else:
             args = {}
+        if not isinstance(args, dict):
+            raise ValueError(f"Arguments for tool '{name}' must be a JSON object")
 
-        if not name:
-            return {"error": "Tool call missing function name"}
         entry = self.tools.get(name)
 
         # If a params_model exists, validate and coerce.
         if entry.params_model:
+            started = time.perf_counter()
             try:
-                params = entry.params_model(**args)
-                args = params.dict() if hasattr(params, "dict") else params.model_dump()
+                args = entry.validator.dump_python(
+                    entry.validator.validate_python(args)
+                )
             except Exception as e:
-                return {"error": f"Invalid arguments for tool '{name}': {str(e)}"}
+                raise ValueError(f"Invalid arguments for tool '{name}': {str(e)}")
+            finally:
+                self.client.events.emit(
+                    "validation",
+                    family="tools",
+                    model=name,
+                    duration=time.perf_counter() - started,
+                )
+        return args
 
-        fn = entry.func
+    async def _maybe_call_tool(
+        self, name: str, arguments: Union[str, Dict[str, Any]]
+    ) -> Any:
+        if not name:
+            return {"error": "Tool call missing function name"}
+        try:
+            args = self._tool_args(name, arguments)
+        except ValueError as e:
+            return {"error": str(e)}
+        return await self._run_tool(name, args)
 
-        # Support async and sync functions. Prefer kwargs call.
+    async def _run_tool(self, name: str, args: Dict[str, Any]) -> Any:
+        entry = self.tools.get(name)
         try:
-            if inspect.iscoroutinefunction(fn):
-                return await fn(**args)
-            # run sync in thread to avoid blocking
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, lambda: fn(**args))
-        except TypeError:
-            # fallback: pass a single dict
-            try:
-                if inspect.iscoroutinefunction(fn):
-                    return await fn(args)
-                loop = asyncio.get_event_loop()
-                return await loop.run_in_executor(None, lambda: fn(args))
-            except Exception as e:
-                return {"error": f"Tool '{name}' failed: {str(e)}"}
+            if entry.cache is None:
+                return await self._invoke_tool(entry, args)
+            # memoized on the validated arguments; errors are not cached
+            return await entry.cache.get_or_create(
+                entry.cache_key(args), lambda: self._invoke_tool(entry, args)
+            )
+        except asyncio.TimeoutError:
+            return {"error": f"Tool '{name}' timed out after {entry.timeout}s"}
         except Exception as e:
             return {"error": f"Tool '{name}' failed: {str(e)}"}
 
+    async def _invoke_tool(self, entry: Any, args: Dict[str, Any]) -> Any:
+        # call convention and executor were resolved at registration
+        call = (
+            functools.partial(entry.func, args)
+            if entry.pass_dict
+            else functools.partial(entry.func, **args)
+        )
+        semaphore = entry.semaphore
+        if entry.is_async:
+            # a timeout cancels the coroutine, so its slot is free on exit
+            if semaphore is None:
+                return await asyncio.wait_for(call(), entry.timeout)
+            async with semaphore:
+                return await asyncio.wait_for(call(), entry.timeout)
+
+        # sync tools run in the registry's pools, never the loop's default
+        loop = asyncio.get_running_loop()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            future = self.tools.executor_for(entry).submit(call)
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        if semaphore is not None:
+            # a timed-out run keeps its worker busy: the slot is only given
+            # back once the function has actually returned
+            future.add_done_callback(lambda _: _release_from_worker(loop, semaphore))
+        return await asyncio.wait_for(asyncio.wrap_future(future), entry.timeout)
+
+    def _prepare_tool_call(self, buf: Dict[str, Any]) -> None:
+        # decode + validate a streamed call once; the outcome is kept on the buffer
+        if buf["args"] is not None or buf["error"] is not None or not buf["name"]:
+            return
+        try:
+            buf["args"] = self._tool_args(buf["name"], buf["arguments"].text())
+        except ValueError as e:
+            buf["error"] = str(e)
+
+    def _start_speculative(self, buf: Dict[str, Any]) -> None:
+        # run a valid call while the rest of the turn is still streaming; feed()
+        # keeps reporting completion on later deltas, so start it only once
+        if buf["task"] is not None or buf["args"] is None:
+            return
+        if not self.tools.get(buf["name"]).speculative:
+            return
+        buf["task"] = asyncio.ensure_future(self._run_tool(buf["name"], buf["args"]))
+
+    @staticmethod
+    def _cancel_speculative(buffers: Dict[str, Dict[str, Any]]) -> None:
+        for buf in buffers.values():
+            if buf["task"] is not None:
+                buf["task"].cancel()
+
+    async def _run_buffered_tool(self, buf: Dict[str, Any]) -> Any:
+        if buf["task"] is not None:
+            return await buf["task"]
+        self._prepare_tool_call(buf)
+        if buf["error"] is not None:
+            return {"error": buf["error"]}
+        return await self._run_tool(buf["name"], buf["args"])
+
     def _tools_param(
-        self, explicit_tools: Optional[List[Dict[str, Any]]]
-    ) -> Optional[List[Dict[str, Any]]]:
+        self,
+        explicit_tools: Optional[List[Dict[str, Any]]],
+        tool_tags: Optional[Iterable[str]] = None,
+    ) -> Union[None, List[Dict[str, Any]], JSONFragment]:
         if explicit_tools is not None:
             return explicit_tools
-        registry_tools = self.tools.to_openai_tools()
-        return registry_tools if registry_tools else None
+        # registry payload, encoded once and spliced into the request body
+        encoded = self.tools.tools_json(tool_tags, self.client.json_codec)
+        return JSONFragment(encoded) if encoded != b"[]" else None
 
     # --------------------------
     # Non-streaming with auto tool execution
@@ -125,11 +288,20 @@ class ChatEndpoint:
         auto_tool_execution: bool = False,
         tools: Optional[List[Dict[str, Any]]] = None,
         tool_choice: Optional[Union[str, Dict[str, Any]]] = "auto",
+        usage_tag: Optional[str] = None,
+        tool_tags: Optional[Iterable[str]] = None,
+        idempotent: bool = True,
         **kwargs: Any,
     ) -> ChatCompletion:
         """
         Non-streaming chat completion.
         If auto_tool_execution=True, loops over tool calls until final answer.
+        Token usage is added to client.usage (under `usage_tag` when given).
+        Registry tools are sent unless `tools` is given; `tool_tags` limits
+        them to the tools registered with one of those tags.
+        Completions have no server-side effect, so the retry policy replays
+        them after 5xx and timeouts like any idempotent call (a replay may be
+        billed twice); idempotent=False restricts retries to 429s.
         """
         if stream:
             warnings.warn(
@@ -137,44 +309,41 @@ class ChatEndpoint:
                 stacklevel=2,
             )
 
-        sdk = self._ensure_sdk()
         msgs: List[ChatCompletionMessageParam] = list(messages)
 
         if not auto_tool_execution:
-            payload = {
-                "model": model,
-                "messages": msgs,
-                "tools": tools,
-                "tool_choice": tool_choice,
-                "stream": False,
-                **kwargs,
-            }
+            payload = self._payload(
+                model, msgs, False, tools=tools, tool_choice=tool_choice, **kwargs
+            )
             try:
-                return await sdk.chat.completions.create(**payload)  # type: ignore[arg-type]
-            except APIStatusError as e:
-                await self._maybe_refresh_and_raise(e)
-            except (APIConnectionError, RateLimitError) as e:
-                raise ConnectionError(str(e))
-            raise RuntimeError("Unreachable")
+                resp = await self._create(payload, idempotent)
+            except APIError as e:
+                if e.status_code == 429:
+                    raise ConnectionError(str(e))
+                raise
+            self.client.usage.record("chat", model, resp.usage, usage_tag)
+            return resp
 
         # Tool loop
-        tools_payload = self._tools_param(tools)
+        tools_payload = self._tools_param(tools, tool_tags)
         loop_count = 0
         while loop_count < self.max_tool_iterations:
             loop_count += 1
+            payload = self._payload(
+                model,
+                msgs,
+                False,
+                tools=tools_payload,
+                tool_choice=tool_choice,
+                **kwargs,
+            )
             try:
-                resp: ChatCompletion = await sdk.chat.completions.create(
-                    model=model,
-                    messages=msgs,
-                    tools=tools_payload,
-                    tool_choice=tool_choice,
-                    stream=False,
-                    **kwargs,
-                )  # type: ignore[arg-type]
-            except APIStatusError as e:
-                await self._maybe_refresh_and_raise(e)
-            except (APIConnectionError, RateLimitError) as e:
-                raise ConnectionError(str(e))
+                resp: ChatCompletion = await self._create(payload, idempotent)
+            except APIError as e:
+                if e.status_code == 429:
+                    raise ConnectionError(str(e))
+                raise
+            self.client.usage.record("chat", model, resp.usage, usage_tag, loop_count)
 
             choice = resp.choices[0]
             msg = choice.message
@@ -201,7 +370,7 @@ class ChatEndpoint:
                     content = (
                         out
                         if isinstance(out, str)
-                        else json.dumps(out, ensure_ascii=False)
+                        else self.client.json_codec.dumps_str(out)
                     )
                     msgs.append(
                         {"role": "tool", "tool_call_id": call.id, "content": content}
@@ -215,80 +384,66 @@ class ChatEndpoint:
         raise RuntimeError("Max tool iterations exceeded")
 
     # --------------------------
-    # Streaming core with retries
+    # Streaming core
     # --------------------------
-    async def _stream_with_retries(
+    def _stream_payload(
         self, model: str, messages: Iterable[ChatCompletionMessageParam], **kwargs: Any
-    ) -> AsyncGenerator[ChatCompletionChunk, None]:
-        attempts = 0
-        sdk = self._ensure_sdk()
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Payload, and whether the usage-only chunk was requested on our own."""
+        hide_usage = self.include_usage and "stream_options" not in kwargs
+        if hide_usage:
+            kwargs["stream_options"] = {"include_usage": True}
+        return self._payload(model, messages, True, **kwargs), hide_usage
+
+    def _open_stream(self, payload: Dict[str, Any], idempotent: bool = True):
+        # The client's retry policy (and 401 refresh) applies until the stream
+        # opens; once chunks flow, a failure is raised rather than replayed so
+        # callers never see duplicated deltas.
+        return self.client._open(
+            "POST",
+            self._url,
+            json=payload,
+            timeout=self._stream_timeout(),
+            retry_policy=self.retry_policy,
+            idempotent=idempotent,
+        )
 
-        while attempts <= self.max_stream_retries:
-            try:
-                stream = await sdk.chat.completions.create(
-                    model=model, messages=messages, stream=True, **kwargs
-                )  # type: ignore[arg-type]
-                async for chunk in stream:
-                    yield chunk
-                return
-            except APIStatusError as e:
-                if (
-                    e.status_code == 401
-                    and self.client.username
-                    and self.client.password
-                ):
-                    attempts += 1
-                    if attempts > self.max_stream_retries:
-                        raise PermissionError(
-                            "Unauthorized and refresh retries exhausted."
-                        )
-                    try:
-                        self.client.logger.info("Token expired, refreshing...")
-                        await self.client.auth.login(
-                            username=self.client.username,
-                            password=self.client.password,
-                            expires_in=1,
+    async def _stream_dicts(
+        self,
+        model: str,
+        messages: Iterable[ChatCompletionMessageParam],
+        usage_tag: Optional[str] = None,
+        usage_iteration: Optional[int] = None,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Decoded chunks as plain dicts; no pydantic model is built."""
+        payload, hide_usage = self._stream_payload(model, messages, **kwargs)
+        usage = self.client.usage
+        events = self.client.events
+        trace = StreamTrace() if events.enabled else None
+        try:
+            async with self._open_stream(payload, idempotent) as response:
+                async for data in iter_sse_data(response.content):
+                    if data == b"[DONE]":
+                        break
+                    if trace is not None:
+                        trace.chunk()
+                    obj = self._decode_frame(data)
+                    if obj.get("usage"):
+                        usage.record(
+                            "chat", model, obj["usage"], usage_tag, usage_iteration
                         )
-                        self._sdk = None
-                        sdk = self._ensure_sdk()
-                        continue
-                    except Exception as auth_error:
-                        self.client.logger.error(f"Refresh failed: {auth_error}")
-                        raise PermissionError("Token refresh failed.") from auth_error
-                else:
-                    raise
-            except (APIConnectionError, RateLimitError, asyncio.TimeoutError) as e:
-                attempts += 1
-                if attempts > self.max_stream_retries:
-                    raise ConnectionError(
-                        f"Maximum attempts ({self.max_stream_retries}) exceeded: {str(e)}"
-                    )
-                delay = self.retry_delay_base * (2 ** (attempts - 1))
-                jitter = delay * 0.1 * random.random()
-                total_delay = delay + jitter
-                self.client.logger.warning(
-                    f"Connection error, retrying in {total_delay:.2f}s (attempt {attempts}/{self.max_stream_retries}): {str(e)}"
-                )
-                await asyncio.sleep(total_delay)
-
-    async def _maybe_refresh_and_raise(self, e: APIStatusError) -> None:
-        if e.status_code == 401 and self.client.username and self.client.password:
-            try:
-                self.client.logger.info("Token expired, refreshing...")
-                await self.client.auth.login(
-                    username=self.client.username,
-                    password=self.client.password,
-                    expires_in=1,
-                )
-                raise PermissionError("Token was expired. Please retry the request.")
-            except Exception as auth_error:
-                self.client.logger.error(f"Refresh failed: {auth_error}")
-                raise PermissionError("Token refresh failed.") from auth_error
-        if e.status_code == 403:
-            raise PermissionError(f"Access forbidden: {e}")
-        if e.status_code == 404:
-            raise ValueError(f"Resource not found: {e}")
-        raise
+                        if hide_usage and not obj.get("choices"):
+                            continue
+                    yield obj
+        except APIError as e:
+            if e.status_code == 429:
+                raise ConnectionError(str(e))
+            raise
+        finally:
+            if trace is not None:
+                events.emit("stream", **trace.attributes(family="chat", model=model))
 
     # --------------------------
     # Streaming with auto tool execution
@@ -300,59 +455,117 @@ class ChatEndpoint:
         auto_tool_execution: bool = False,
         tools: Optional[List[Dict[str, Any]]] = None,
         tool_choice: Optional[Union[str, Dict[str, Any]]] = "auto",
+        usage_tag: Optional[str] = None,
+        tool_tags: Optional[Iterable[str]] = None,
+        idempotent: bool = True,
         **kwargs: Any,
     ) -> AsyncGenerator[ChatCompletionChunk, None]:
+        async for obj in self._stream_turns(
+            model,
+            messages,
+            auto_tool_execution,
+            tools,
+            tool_choice,
+            usage_tag,
+            tool_tags,
+            idempotent,
+            **kwargs,
+        ):
+            yield ChatCompletionChunk.construct(**obj)
+
+    async def _stream_turns(
+        self,
+        model: str,
+        messages: Iterable[ChatCompletionMessageParam],
+        auto_tool_execution: bool = False,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = "auto",
+        usage_tag: Optional[str] = None,
+        tool_tags: Optional[Iterable[str]] = None,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Chunk dicts of the whole exchange: with auto_tool_execution, tool-call
+        chunks are buffered and executed between turns instead of yielded.
+        """
         if not auto_tool_execution:
-            async for chunk in self._stream_with_retries(model, messages, **kwargs):
-                yield chunk
+            async for obj in self._stream_dicts(
+                model, messages, usage_tag, idempotent=idempotent, **kwargs
+            ):
+                yield obj
             return
 
         msgs: List[ChatCompletionMessageParam] = list(messages)
-        tools_payload = self._tools_param(tools)
+        tools_payload = self._tools_param(tools, tool_tags)
 
-        for _ in range(self.max_tool_iterations):
+        for iteration in range(1, self.max_tool_iterations + 1):
             # one assistant turn
             tool_call_buffers: Dict[str, Dict[str, Any]] = {}  # key = f"idx-{index}"
             saw_tool_call = False
 
-            async for chunk in self._stream_with_retries(
-                model,
-                msgs,
-                tools=tools_payload,
-                tool_choice=tool_choice,
-                **kwargs,
-            ):
-                ch = chunk.choices[0]
-                delta = ch.delta
-
-                # accumulate tool calls; suppress them from user output
-                if delta and getattr(delta, "tool_calls", None):
-                    saw_tool_call = True
-                    for tc in delta.tool_calls:
-                        # stable key based on streamed index, never by id
-                        tc_index = getattr(tc, "index", None)
-                        key = f"idx-{tc_index if tc_index is not None else 0}"
-                        buf = tool_call_buffers.setdefault(
-                            key, {"id": None, "name": None, "arguments": ""}
-                        )
-
-                        # fill id when it appears
-                        if getattr(tc, "id", None):
-                            buf["id"] = tc.id
-
-                        # function fragments arrive over time
-                        fn = getattr(tc, "function", None)
-                        if fn is not None:
-                            if getattr(fn, "name", None):
-                                buf["name"] = fn.name
-                            if getattr(fn, "arguments", None):
-                                # arguments are streamed text; just concatenate
-                                buf["arguments"] += fn.arguments or ""
-                    continue  # do not yield tool-call chunks
-
-                # pass through normal content chunks until we see a tool call
-                if not saw_tool_call:
-                    yield chunk
+            try:
+                async for obj in self._stream_dicts(
+                    model,
+                    msgs,
+                    usage_tag,
+                    iteration,
+                    idempotent,
+                    tools=tools_payload,
+                    tool_choice=tool_choice,
+                    **kwargs,
+                ):
+                    choices = obj.get("choices")
+                    if not choices:
+                        # trailing usage chunk of the turn
+                        if not saw_tool_call:
+                            yield obj
+                        continue
+                    delta = _first_delta(choices, obj)
+
+                    # accumulate tool calls; suppress them from user output
+                    tool_calls = delta.get("tool_calls") if delta else None
+                    if tool_calls:
+                        saw_tool_call = True
+                        for tc in tool_calls:
+                            # stable key based on streamed index, never by id
+                            tc_index = tc.get("index")
+                            key = f"idx-{tc_index if tc_index is not None else 0}"
+                            buf = tool_call_buffers.get(key)
+                            if buf is None:
+                                buf = tool_call_buffers[key] = {
+                                    "id": None,
+                                    "name": None,
+                                    "arguments": JSONStreamBuffer(),
+                                    "args": None,
+                                    "error": None,
+                                    "task": None,
+                                }
+
+                            # fill id when it appears
+                            if tc.get("id"):
+                                buf["id"] = tc["id"]
+
+                            # function fragments arrive over time
+                            fn = tc.get("function")
+                            if fn:
+                                if fn.get("name"):
+                                    buf["name"] = fn["name"]
+                                if fn.get("arguments") and buf["arguments"].feed(
+                                    fn["arguments"]
+                                ):
+                                    # arguments complete: validate while the turn streams
+                                    self._prepare_tool_call(buf)
+                                    self._start_speculative(buf)
+                        continue  # do not yield tool-call chunks
+
+                    # pass through normal content chunks until we see a tool call
+                    if not saw_tool_call:
+                        yield obj
+            except BaseException:
+                # the turn failed or the caller stopped: drop speculative runs
+                self._cancel_speculative(tool_call_buffers)
+                raise
 
             # stream ended for this turn
             if saw_tool_call:
@@ -362,6 +575,7 @@ class ChatEndpoint:
                     name = tc["name"]
                     if not name:
                         # still no name after the turn finished -> protocol error
+                        self._cancel_speculative(tool_call_buffers)
                         raise RuntimeError(f"Missing function name for tool call {key}")
                     call_id = tc["id"] or key  # fall back to idx-based id if necessary
                     tool_calls_payload.append(
@@ -370,7 +584,7 @@ class ChatEndpoint:
                             "type": "function",
                             "function": {
                                 "name": name,
-                                "arguments": tc["arguments"],
+                                "arguments": tc["arguments"].text(),
                             },
                         }
                     )
@@ -389,8 +603,8 @@ class ChatEndpoint:
                 id_name_args: List[Tuple[str, str, str]] = []
                 for key, tc in tool_call_buffers.items():
                     call_id = tc["id"] or key
-                    id_name_args.append((call_id, tc["name"], tc["arguments"]))
-                    execs.append(self._maybe_call_tool(tc["name"], tc["arguments"]))
+                    id_name_args.append((call_id, tc["name"], tc["arguments"].text()))
+                    execs.append(self._run_buffered_tool(tc))
                 results = await asyncio.gather(*execs)
 
                 # append tool results
@@ -398,7 +612,7 @@ class ChatEndpoint:
                     content = (
                         out
                         if isinstance(out, str)
-                        else json.dumps(out, ensure_ascii=False)
+                        else self.client.json_codec.dumps_str(out)
                     )
                     msgs.append(
                         {
@@ -427,26 +641,29 @@ class ChatEndpoint:
         return_reasoning: bool = False,
         **kwargs: Any,
     ) -> AsyncGenerator[str, None]:
-        async for event in self.stream(
-            model, messages, auto_tool_execution=auto_tool_execution, **kwargs
+        """
+        Content (and optionally reasoning) deltas only, read straight from the
+        decoded frames without building chunk models. Malformed frames raise
+        APIError instead of being skipped.
+        """
+        async for obj in self._stream_turns(
+            model, messages, auto_tool_execution, **kwargs
         ):
-            try:
-                if isinstance(event, ChatCompletionChunk):
-                    choices = event.choices or []
-                    if choices:
-                        delta = choices[0].delta or {}
-
-                        if return_reasoning:
-                            reasoning = delta.reasoning
-                            if reasoning is not None:
-                                yield reasoning
+            choices = obj.get("choices")
+            if not choices:
+                continue
+            delta = _first_delta(choices, obj)
+            if not delta:
+                continue
 
-                        content = delta.content
-                        if content is not None:
-                            yield content
+            if return_reasoning:
+                reasoning = delta.get("reasoning")
+                if reasoning is not None:
+                    yield reasoning
 
-            except Exception:
-                continue
+            content = delta.get("content")
+            if content is not None:
+                yield content
 
     # --------------------------
     # Streaming: raw SSE lines
@@ -456,11 +673,74 @@ class ChatEndpoint:
         model: str,
         messages: Iterable[ChatCompletionMessageParam],
         auto_tool_execution: bool = False,
+        passthrough: bool = False,
+        on_tool_call: Optional[Callable[[bytes], Any]] = None,
         **kwargs: Any,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[Union[str, bytes], None]:
+        """
+        Server-sent events ready to relay ("data: ...\n\n"), ending with [DONE].
+
+        By default each chunk is parsed and re-encoded (str frames). With
+        passthrough=True the upstream frames are yielded unchanged as bytes:
+        nothing is parsed except error frames (raised as APIError) and the
+        usage frame (accounted); frames carrying tool calls are handed to
+        `on_tool_call`. Passthrough can't run tools (auto_tool_execution).
+        """
+        if passthrough:
+            if auto_tool_execution:
+                raise ValueError("passthrough can't be used with auto_tool_execution")
+            async for frame in self._relay_frames(
+                model, messages, on_tool_call, **kwargs
+            ):
+                yield frame
+            return
+
+        dumps_str = self.client.json_codec.dumps_str
         async for chunk in self.stream(
             model, messages, auto_tool_execution=auto_tool_execution, **kwargs
         ):
-            line = f"data: {json.dumps(chunk.model_dump(), separators=(',', ':'))}\n\n"
+            line = f"data: {dumps_str(chunk.model_dump())}\n\n"
             yield line
         yield "data: [DONE]\n\n"
+
+    async def _relay_frames(
+        self,
+        model: str,
+        messages: Iterable[ChatCompletionMessageParam],
+        on_tool_call: Optional[Callable[[bytes], Any]] = None,
+        usage_tag: Optional[str] = None,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> AsyncGenerator[bytes, None]:
+        payload, hide_usage = self._stream_payload(model, messages, **kwargs)
+        loads = self.client.json_codec.loads
+        events = self.client.events
+        trace = StreamTrace() if events.enabled else None
+        try:
+            async with self._open_stream(payload, idempotent) as response:
+                async for frame in iter_sse_frames(response.content):
+                    # cheap byte scans; only rare frames are decoded
+                    if b"[DONE]" in frame and len(frame) < 32:
+                        break
+                    if trace is not None:
+                        trace.chunk()
+                    if b'"error"' in frame:
+                        self._decode_frame(sse_frame_data(frame))
+                    if b'"usage":{' in frame or b'"usage": {' in frame:
+                        obj = loads(sse_frame_data(frame))
+                        self.client.usage.record(
+                            "chat", model, obj.get("usage"), usage_tag
+                        )
+                        if hide_usage and not obj.get("choices"):
+                            continue
+                    if on_tool_call is not None and b'"tool_calls"' in frame:
+                        on_tool_call(frame)
+                    yield frame
+        except APIError as e:
+            if e.status_code == 429:
+                raise ConnectionError(str(e))
+            raise
+        finally:
+            if trace is not None:
+                events.emit("stream", **trace.attributes(family="chat", model=model))
+        yield b"data: [DONE]\n\n"
@@ -1,10 +1,330 @@
-from ..models import EmbeddingsRequest
+import asyncio
+from collections import deque
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from ..models import EmbeddingData, EmbeddingsRequest
+from ..modules.embedding_cache import EmbeddingCache
+from ..modules.vectors import EmbeddingMatrix, decode_vector
+from ..utils import as_async_iterable, estimate_text_tokens
+
+# coalescing key: (model, encoding_format)
+_BatchKey = Tuple[str, Optional[str]]
+
+
+class _EmbeddingsCoalescer:
+    """
+    Merges concurrent small get_embeddings calls for the same model into one
+    upstream request (per model and encoding format). A batch is sent when `max_batch_size` inputs are queued
+    or `linger` seconds after its first input, whichever comes first.
+    """
+
+    def __init__(
+        self, endpoint: "EmbeddingsEndpoint", linger: float, max_batch_size: int
+    ):
+        self.endpoint = endpoint
+        self.linger = linger
+        self.max_batch_size = max_batch_size
+        self._queues: Dict[_BatchKey, List[Tuple[List[str], asyncio.Future]]] = {}
+        self._sizes: Dict[_BatchKey, int] = {}
+        self._timers: Dict[_BatchKey, asyncio.TimerHandle] = {}
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, request: EmbeddingsRequest) -> Dict[str, Any]:
+        if len(request.input) >= self.max_batch_size:
+            return await self.endpoint._post(request)
+
+        model = (request.model, request.encoding_format)
+        if self._sizes.get(model, 0) + len(request.input) > self.max_batch_size:
+            self._flush(model)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queues.setdefault(model, []).append((list(request.input), future))
+        self._sizes[model] = self._sizes.get(model, 0) + len(request.input)
+
+        if self._sizes[model] >= self.max_batch_size:
+            self._flush(model)
+        elif model not in self._timers:
+            self._timers[model] = loop.call_later(self.linger, self._flush, model)
+        return await future
+
+    def _flush(self, model: _BatchKey) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._queues.pop(model, None)
+        self._sizes.pop(model, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._send(model, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(
+        self, key: _BatchKey, batch: List[Tuple[List[str], asyncio.Future]]
+    ) -> None:
+        model, encoding_format = key
+        inputs = [text for texts, _ in batch for text in texts]
+        try:
+            response = await self.endpoint._post(
+                EmbeddingsRequest(
+                    input=inputs, model=model, encoding_format=encoding_format
+                )
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        data = sorted(response.get("data", []), key=lambda d: d["index"])
+        usage = response.get("usage") or {}
+        total_cost = sum(estimate_text_tokens(t) for t in inputs)
+        offset = 0
+        for texts, future in batch:
+            part = data[offset : offset + len(texts)]
+            share = sum(estimate_text_tokens(t) for t in texts) / total_cost
+            offset += len(texts)
+            if future.done():
+                # caller was cancelled while the batch was in flight
+                continue
+            future.set_result(
+                {
+                    **response,
+                    "data": [{**d, "index": i} for i, d in enumerate(part)],
+                    # upstream usage is apportioned by estimated token share
+                    "usage": {k: round(v * share) for k, v in usage.items()},
+                }
+            )
 
 
 class EmbeddingsEndpoint:
     def __init__(self, client):
         self.client = client
+        self._coalescer: Optional[_EmbeddingsCoalescer] = None
+        self.cache: Optional[EmbeddingCache] = None
 
-    async def get_embeddings(self, request: EmbeddingsRequest):
+    async def get_embeddings(
+        self, request: EmbeddingsRequest, usage_tag: Optional[str] = None
+    ):
+        if self.cache is not None:
+            response = await self._cached(request, self._send)
+        else:
+            response = await self._send(request)
+        # coalesced calls carry their share, cached ones only their misses
+        self.client.usage.record(
+            "embeddings", request.model, response.get("usage"), usage_tag
+        )
+        return response
+
+    async def _send(self, request: EmbeddingsRequest) -> Dict[str, Any]:
+        if self._coalescer is not None:
+            return await self._coalescer.submit(request)
+        return await self._post(request)
+
+    async def _post(self, request: EmbeddingsRequest) -> Dict[str, Any]:
         url = f"{self.client.base_url}/embeddings"
-        return await self.client._request("POST", url, json=request.model_dump())
+        return await self.client._request(
+            "POST", url, json=request.model_dump(exclude_none=True), hedge=True
+        )
+
+    async def get_embeddings_matrix(
+        self,
+        request: EmbeddingsRequest,
+        encoding_format: str = "base64",
+        usage_tag: Optional[str] = None,
+    ) -> EmbeddingMatrix:
+        """
+        Like get_embeddings, but decodes straight into one float32 matrix
+        (numpy if installed, array('f') otherwise) without per-vector models.
+        base64 transfers packed float32 buffers that are viewed, not parsed.
+        """
+        request = request.model_copy(update={"encoding_format": encoding_format})
+        return EmbeddingMatrix.from_response(
+            await self.get_embeddings(request, usage_tag)
+        )
+
+    # --------------------------
+    # Request coalescing
+    # --------------------------
+    def enable_coalescing(
+        self, linger: float = 0.005, max_batch_size: int = 64
+    ) -> None:
+        """
+        Opt-in: concurrent get_embeddings calls for the same model are merged
+        into one upstream /embeddings request. Each caller still receives its
+        own response, with `data` (and apportioned `usage`) for its inputs only.
+        """
+        if linger < 0 or max_batch_size < 1:
+            raise ValueError("linger must be >= 0 and max_batch_size >= 1")
+        self._coalescer = _EmbeddingsCoalescer(self, linger, max_batch_size)
+
+    def disable_coalescing(self) -> None:
+        self._coalescer = None
+
+    # --------------------------
+    # Caching
+    # --------------------------
+    def enable_cache(
+        self,
+        cache: Optional[EmbeddingCache] = None,
+        max_entries: int = 10_000,
+        path: Optional[str] = None,
+    ) -> EmbeddingCache:
+        """
+        Serves repeated (model, text) pairs from an EmbeddingCache; only misses
+        are sent upstream. Pass an existing cache to share it between clients.
+        Cached responses always carry float lists, whatever the encoding format.
+        """
+        self.cache = cache or EmbeddingCache(max_entries=max_entries, path=path)
+        return self.cache
+
+    def disable_cache(self) -> None:
+        self.cache = None
+
+    async def _cached(
+        self,
+        request: EmbeddingsRequest,
+        send: Callable[[EmbeddingsRequest], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        texts = list(request.input)
+        vectors = await self.cache.get_many(request.model, texts)
+
+        response: Dict[str, Any] = {
+            "object": "list",
+            "model": request.model,
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+        # identical misses within one request are only embedded once
+        misses = list(
+            dict.fromkeys(t for t, v in zip(texts, vectors, strict=True) if v is None)
+        )
+        if misses:
+            response = await send(request.model_copy(update={"input": misses}))
+            # float lists and base64 buffers alike are stored as float32
+            fetched = [
+                decode_vector(d["embedding"])
+                for d in sorted(response["data"], key=lambda d: d["index"])
+            ]
+            await self.cache.put_many(request.model, misses, fetched)
+            by_text = {t: v.tolist() for t, v in zip(misses, fetched, strict=True)}
+            vectors = [
+                v if v is not None else by_text[t]
+                for t, v in zip(texts, vectors, strict=True)
+            ]
+
+        return {
+            **response,
+            "data": [
+                {"object": "embedding", "embedding": v, "index": i}
+                for i, v in enumerate(vectors)
+            ],
+        }
+
+    # --------------------------
+    # Bulk embedding
+    # --------------------------
+    async def embed_many(
+        self,
+        texts: Union[Iterable[str], AsyncIterable[str]],
+        model: str,
+        batch_size: int = 128,
+        max_concurrency: int = 4,
+        max_batch_tokens: int = 8000,
+        ordered: bool = True,
+        usage_tag: Optional[str] = None,
+    ) -> AsyncGenerator[EmbeddingData, None]:
+        """
+        Embeds an arbitrarily large stream of texts.
+
+        Input is read lazily and split into batches of at most `batch_size`
+        items and about `max_batch_tokens` estimated tokens; up to
+        `max_concurrency` batches are in flight at once. Results are yielded as
+        batches finish, with `index` set to the position in the input. With
+        ordered=True they come out in input order; otherwise as soon as each
+        batch completes. Memory is bounded by the in-flight batches.
+        """
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be >= 1")
+
+        pending: Deque[asyncio.Task] = deque()
+        batches = self._batches(texts, batch_size, max_batch_tokens)
+        try:
+            async for offset, batch in batches:
+                pending.append(
+                    asyncio.ensure_future(
+                        self._embed_batch(offset, batch, model, usage_tag)
+                    )
+                )
+                if len(pending) < max_concurrency:
+                    continue
+                for item in await self._next_done(pending, ordered):
+                    yield item
+            while pending:
+                for item in await self._next_done(pending, ordered):
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _next_done(
+        pending: Deque[asyncio.Task], ordered: bool
+    ) -> List[EmbeddingData]:
+        if ordered:
+            return await pending.popleft()
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        task = done.pop()
+        pending.remove(task)
+        return task.result()
+
+    @staticmethod
+    async def _batches(
+        texts: Union[Iterable[str], AsyncIterable[str]],
+        batch_size: int,
+        max_batch_tokens: int,
+    ) -> AsyncGenerator[Tuple[int, List[str]], None]:
+        batch: List[str] = []
+        tokens = 0
+        offset = 0
+
+        async for text in as_async_iterable(texts):
+            cost = estimate_text_tokens(text)
+            if batch and (len(batch) >= batch_size or tokens + cost > max_batch_tokens):
+                yield offset, batch
+                offset += len(batch)
+                batch, tokens = [], 0
+            batch.append(text)
+            tokens += cost
+        if batch:
+            yield offset, batch
+
+    async def _embed_batch(
+        self, offset: int, batch: List[str], model: str, usage_tag: Optional[str]
+    ) -> List[EmbeddingData]:
+        # already batched: bypass the coalescer
+        request = EmbeddingsRequest(input=batch, model=model)
+        if self.cache is not None:
+            response = await self._cached(request, self._post)
+        else:
+            response = await self._post(request)
+        self.client.usage.record("embeddings", model, response.get("usage"), usage_tag)
+        data = [EmbeddingData.model_validate(d) for d in response["data"]]
+        data.sort(key=lambda d: d.index)
+        for d in data:
+            d.index += offset
+        return data
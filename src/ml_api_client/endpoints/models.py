@@ -4,8 +4,8 @@ class ModelsEndpoint:
 
     async def list_models(self):
         url = f"{self.client.base_url}/models/"
-        return await self.client._request("GET", url)
+        return await self.client._request("GET", url, hedge=True)
 
     async def retrieve_model(self, provider: str, model_id: str):
         url = f"{self.client.base_url}/models/{provider}/{model_id}"
-        return await self.client._request("GET", url)
+        return await self.client._request("GET", url, hedge=True)
@@ -1,3 +1,19 @@
+import asyncio
+from dataclasses import replace
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
 from ..models import (
     CreateVectorStoreRequest,
     CreateVectorStoreResponse,
@@ -8,16 +24,49 @@ from ..models import (
     VectorStore,
     VectorStoreSearchRequest,
 )
+from ..modules.ingestion import (
+    ChunkInput,
+    IngestCheckpoint,
+    IngestResult,
+    iter_batches,
+)
+from ..modules.retry import RetryPolicy, RetryStats
+from ..modules.ttl_cache import TTLCache
+
+
+def _hits(response: Any) -> List[Dict[str, Any]]:
+    # the search payload is a list of hits, bare or under "data"/"results"
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        for key in ("data", "results", "points"):
+            if isinstance(response.get(key), list):
+                return response[key]
+    return []
+
+
+def _hit_key(store_id: str, hit: Dict[str, Any]) -> Tuple[str, str]:
+    for field in ("id", "chunk_id", "point_id"):
+        if hit.get(field) is not None:
+            return store_id, str(hit[field])
+    for field in ("text", "chunk", "content", "document"):
+        if hit.get(field) is not None:
+            return store_id, str(hit[field])
+    return store_id, repr(sorted(hit.items(), key=lambda kv: kv[0]))
 
 
 class VectorStoresEndpoint:
     def __init__(self, client):
         self.client = client
+        # short-lived cache of (store, query, limit) lookups for search_many
+        self.search_cache = TTLCache(ttl=30.0, max_entries=1024)
+        # local replicas (LocalVectorIndex) answering searches per store
+        self.replicas: Dict[str, Any] = {}
 
     # New API
     async def list_vector_stores(self) -> ListVectorStoresResponse | dict:
         url = f"{self.client.base_url}/vector_stores"
-        return await self.client._request("GET", url)
+        return await self.client._request("GET", url, hedge=True)
 
     async def create_vector_store(
         self, request: CreateVectorStoreRequest
@@ -27,25 +76,255 @@ class VectorStoresEndpoint:
 
     async def get_vector_store(self, vector_store_id: str) -> VectorStore | dict:
         url = f"{self.client.base_url}/vector_stores/{vector_store_id}"
-        return await self.client._request("GET", url)
+        return await self.client._request("GET", url, hedge=True)
 
     async def search_vector_store(
-        self, vector_store_id: str, request: VectorStoreSearchRequest
+        self,
+        vector_store_id: str,
+        request: VectorStoreSearchRequest,
+        query_vector: Optional[Sequence[float]] = None,
     ) -> dict:
+        """
+        A fresh local replica answers the search itself, with `query_vector`
+        when given; if the query can't be embedded locally, the server does it.
+        """
+        replica = self.replicas.get(vector_store_id)
+        if replica is not None and replica.is_fresh:
+            vector = query_vector
+            if vector is None:
+                try:
+                    vector = await replica.embed_query(request.query)
+                except Exception as e:
+                    self.client.logger.warning(
+                        f"Replica query embedding failed, searching on the server: {e}"
+                    )
+            if vector is not None:
+                return replica.search_vector(vector, request.limit)
         url = f"{self.client.base_url}/vector_stores/{vector_store_id}/search"
-        return await self.client._request("POST", url, json=request.model_dump())
+        return await self.client._request(
+            "POST", url, json=request.model_dump(), hedge=True
+        )
 
     async def update_vector_store(
         self, vector_store_id: str, request: UpdateVectorStoreRequest
     ) -> UpdateVectorStoreResponse | dict:
+        self._invalidate_store(vector_store_id)
         url = f"{self.client.base_url}/vector_stores/{vector_store_id}"
-        return await self.client._request("PUT", url, json=request.model_dump())
+        try:
+            return await self.client._request("PUT", url, json=request.model_dump())
+        finally:
+            self._invalidate_store(vector_store_id)
 
     async def delete_vector_store(
         self, vector_store_id: str
     ) -> DeleteVectorStoreResponse | dict:
+        self._invalidate_store(vector_store_id)
+        url = f"{self.client.base_url}/vector_stores/{vector_store_id}"
+        try:
+            return await self.client._request("DELETE", url)
+        finally:
+            self._invalidate_store(vector_store_id)
+
+    # --------------------------
+    # Local replicas
+    # --------------------------
+    def attach_replica(self, index) -> None:
+        """Answers searches on index.vector_store_id locally while it is fresh."""
+        self.replicas[index.vector_store_id] = index
+
+    def detach_replica(self, vector_store_id: str) -> None:
+        self.replicas.pop(vector_store_id, None)
+
+    def _invalidate_store(self, vector_store_id: str) -> None:
+        # called around writes: a search overlapping one may cache old contents
+        self.search_cache.invalidate_prefix((vector_store_id,))
+        replica = self.replicas.get(vector_store_id)
+        if replica is not None:
+            replica.mark_stale()
+
+    # --------------------------
+    # Multi-query search
+    # --------------------------
+    async def search_many(
+        self,
+        searches: Iterable[Tuple[str, str]],
+        limit: int = 5,
+        max_concurrency: int = 8,
+        ranking: str = "rrf",
+        rrf_k: int = 60,
+        top_k: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs (vector_store_id, query) searches concurrently and fuses the hits.
+
+        Hits found by several searches are merged (by id, or text when there is
+        none) and ranked by reciprocal-rank fusion (ranking="rrf") or by their
+        best score (ranking="score", higher is better). Each returned hit
+        carries `vector_store_id`, the `queries` that found it and `fused_score`.
+        Identical (store, query, limit) lookups are served from `search_cache`
+        until a write to that store (update, delete, ingest) drops them.
+        """
+        if ranking not in ("rrf", "score"):
+            raise ValueError("ranking must be 'rrf' or 'score'")
+        pairs: Sequence[Tuple[str, str]] = list(dict.fromkeys(searches))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(store_id: str, query: str) -> Any:
+            async with semaphore:
+                request = VectorStoreSearchRequest(query=query, limit=limit)
+                if not use_cache:
+                    return await self.search_vector_store(store_id, request)
+                return await self.search_cache.get_or_create(
+                    (store_id, query, limit),
+                    lambda: self.search_vector_store(store_id, request),
+                )
+
+        responses = await asyncio.gather(*(_one(s, q) for s, q in pairs))
+
+        merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for (store_id, query), response in zip(pairs, responses, strict=True):
+            for rank, hit in enumerate(_hits(response), start=1):
+                key = _hit_key(store_id, hit)
+                entry = merged.get(key)
+                if entry is None:
+                    entry = merged[key] = {
+                        **hit,
+                        "vector_store_id": store_id,
+                        "queries": [],
+                        "fused_score": 0.0 if ranking == "rrf" else float("-inf"),
+                    }
+                entry["queries"].append(query)
+                if ranking == "rrf":
+                    entry["fused_score"] += 1.0 / (rrf_k + rank)
+                else:
+                    score = hit.get("score")
+                    if isinstance(score, (int, float)):
+                        entry["fused_score"] = max(entry["fused_score"], score)
+
+        ranked = sorted(merged.values(), key=lambda h: h["fused_score"], reverse=True)
+        return ranked[:top_k] if top_k is not None else ranked
+
+    # --------------------------
+    # Bulk ingestion
+    # --------------------------
+    async def ingest(
+        self,
+        vector_store_id: str,
+        chunks: Union[Iterable[ChunkInput], AsyncIterable[ChunkInput]],
+        max_batch_chunks: int = 256,
+        max_batch_bytes: int = 1_000_000,
+        max_concurrency: int = 4,
+        max_attempts: int = 3,
+        checkpoint: Optional[Union[str, IngestCheckpoint]] = None,
+        on_progress: Optional[Callable[[IngestResult], Any]] = None,
+    ) -> IngestResult:
+        """
+        Streams chunks (text, or (text, metadata) pairs) into a vector store.
+
+        Input is read lazily and grouped into PUT batches bounded by chunk count
+        and body size; up to `max_concurrency` batches run at once. A failed
+        batch is retried on its own under the client's retry policy, with up to
+        `max_attempts` attempts. Ingest opts its PUTs in to replays after 5xx and
+        timeouts, so a batch the server committed before failing may be appended
+        twice (max_attempts=1 never replays). With `checkpoint` (a JSON file
+        path or an IngestCheckpoint), completed batches are recorded and skipped when the
+        same ingest is run again, so an interrupted ingest can resume.
+        """
+        if isinstance(checkpoint, str):
+            checkpoint = IngestCheckpoint.load(checkpoint)
+        elif checkpoint is None:
+            checkpoint = IngestCheckpoint()
+        checkpoint.bind(vector_store_id, [max_batch_chunks, max_batch_bytes])
+
+        result = IngestResult(
+            vector_store_id=vector_store_id, chunks_added=checkpoint.chunks_added
+        )
+        # Same policy and retry budget as the client; own attempts and counters
+        policy = replace(
+            self.client.retry_policy, max_attempts=max_attempts, stats=RetryStats()
+        )
+        pending: Set[asyncio.Task] = set()
+        error: Optional[BaseException] = None
+
+        async def _drain(until: int) -> None:
+            nonlocal error
+            while len(pending) > until:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is not None and error is None:
+                        error = task.exception()
+
+        try:
+            async for seq, texts, metas in iter_batches(
+                chunks, max_batch_chunks, max_batch_bytes
+            ):
+                if seq in checkpoint.completed:
+                    result.batches_skipped += 1
+                    continue
+                pending.add(
+                    asyncio.ensure_future(
+                        self._ingest_batch(
+                            vector_store_id,
+                            seq,
+                            texts,
+                            metas,
+                            policy,
+                            checkpoint,
+                            result,
+                            on_progress,
+                        )
+                    )
+                )
+                await _drain(max_concurrency - 1)
+                if error is not None:
+                    break
+            # let in-flight batches finish so the checkpoint is accurate
+            await _drain(0)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if error is not None:
+            raise error
+        return result
+
+    async def _ingest_batch(
+        self,
+        vector_store_id: str,
+        seq: int,
+        texts: List[str],
+        metas: List[Dict[str, Any]],
+        policy: RetryPolicy,
+        checkpoint: IngestCheckpoint,
+        result: IngestResult,
+        on_progress: Optional[Callable[[IngestResult], Any]],
+    ) -> None:
+        self._invalidate_store(vector_store_id)
         url = f"{self.client.base_url}/vector_stores/{vector_store_id}"
-        return await self.client._request("DELETE", url)
+        request = UpdateVectorStoreRequest(chunks=texts, metadata=metas)
+        try:
+            response = await self.client._request(
+                "PUT",
+                url,
+                json=request.model_dump(),
+                retry_policy=policy,
+                idempotent=True,  # ingest opts in to replaying failed batches
+            )
+        finally:
+            result.retries = policy.stats.retries
+            self._invalidate_store(vector_store_id)
+
+        added = int(response.get("chunks_added", len(texts)))
+        checkpoint.mark_done(seq, added)
+        result.chunks_added += added
+        result.chunks_sent += len(texts)
+        result.batches_done += 1
+        if on_progress is not None:
+            on_progress(result)
 
     # Backward-compat aliases
     async def list_collections(self):
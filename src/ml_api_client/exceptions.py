@@ -0,0 +1,17 @@
+from typing import Optional
+
+
+class APIError(Exception):
+    """Exception personnalisée pour les erreurs d'API."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class CircuitOpenError(ConnectionError):
+    """Levée sans appel réseau quand le disjoncteur d'un endpoint est ouvert."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        self.retry_after = retry_after
+        super().__init__(message)
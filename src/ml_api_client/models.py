@@ -92,6 +92,9 @@ class EmbeddingsResponse(BaseModel):
 class EmbeddingsRequest(BaseModel):
     input: List[str]
     model: str
+    encoding_format: Optional[str] = Field(
+        None, description="float (default) or base64 (packed little-endian float32)"
+    )
 
 
 # ---------------
@@ -0,0 +1,215 @@
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+__all__ = ["Chunk", "TextChunker"]
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class Chunk(NamedTuple):
+    """A (text, metadata) pair, directly usable by VectorStoresEndpoint.ingest."""
+
+    text: str
+    metadata: Dict[str, Any]
+
+
+# --------------------------
+# Chunker
+# --------------------------
+@dataclass(frozen=True)
+class TextChunker:
+    """
+    Streaming, overlap-aware text splitter.
+
+    mode="characters": chunk_size / overlap are counted in characters
+    mode="tokens":     counted in approximate tokens (chars_per_token chars each)
+    mode="sentences":  counted in sentences; text without terminators is cut
+                       into sentences of at most max_sentence_chars
+
+    Character and token chunks end on whitespace when one is found in the
+    second half of the window. Files are read in blocks of `read_size`
+    characters, so a document is never loaded whole.
+
+    Usage:
+        chunker = TextChunker(mode="tokens", chunk_size=256, overlap=32)
+        await client.vector_stores.ingest(store_id, chunker.chunk_file("doc.txt"))
+    """
+
+    mode: str = "characters"
+    chunk_size: int = 1000
+    overlap: int = 200
+    chars_per_token: int = 4
+    read_size: int = 65536
+    max_sentence_chars: int = 10000
+
+    def __post_init__(self) -> None:
+        if self.mode not in ("characters", "tokens", "sentences"):
+            raise ValueError("mode must be 'characters', 'tokens' or 'sentences'")
+        if self.chunk_size < 1 or not 0 <= self.overlap < self.chunk_size:
+            raise ValueError("chunk_size must be >= 1 and 0 <= overlap < chunk_size")
+        if self.max_sentence_chars < 1:
+            raise ValueError("max_sentence_chars must be >= 1")
+
+    # --------------------------
+    # Entry points
+    # --------------------------
+    def chunk_text(self, text: str, source: Optional[str] = None) -> Iterator[Chunk]:
+        return self._chunk_pieces([text], source)
+
+    def chunk_file(
+        self, path: PathLike, encoding: str = "utf-8", source: Optional[str] = None
+    ) -> Iterator[Chunk]:
+        source = source if source is not None else os.fspath(path)
+        with open(path, "r", encoding=encoding) as f:
+            yield from self._chunk_pieces(
+                iter(lambda: f.read(self.read_size), ""), source
+            )
+
+    def chunk_files(
+        self,
+        paths: Iterable[PathLike],
+        max_workers: Optional[int] = None,
+        encoding: str = "utf-8",
+    ) -> Iterator[Chunk]:
+        """
+        Chunks many files, in input order. With max_workers > 1 files are split
+        on a process pool; at most 2 * max_workers files are in flight.
+        """
+        if not max_workers or max_workers <= 1:
+            for path in paths:
+                yield from self.chunk_file(path, encoding=encoding)
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            pending: Deque[Future] = deque()
+            for path in paths:
+                pending.append(pool.submit(_chunk_file, self, path, encoding))
+                if len(pending) >= 2 * max_workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    # --------------------------
+    # Splitting
+    # --------------------------
+    def _chunk_pieces(
+        self, pieces: Iterable[str], source: Optional[str]
+    ) -> Iterator[Chunk]:
+        if self.mode == "sentences":
+            windows = self._sentence_windows(pieces)
+            position_key = "start_sentence"
+        else:
+            scale = self.chars_per_token if self.mode == "tokens" else 1
+            windows = self._char_windows(
+                pieces, self.chunk_size * scale, self.overlap * scale
+            )
+            position_key = "start_char"
+
+        index = 0
+        for start, text in windows:
+            text = text.strip()
+            if not text:
+                continue
+            metadata: Dict[str, Any] = {"chunk_index": index, position_key: start}
+            if source is not None:
+                metadata["source"] = source
+            yield Chunk(text, metadata)
+            index += 1
+
+    @staticmethod
+    def _char_windows(
+        pieces: Iterable[str], size: int, overlap: int
+    ) -> Iterator[Tuple[int, str]]:
+        buf = ""
+        base = 0  # absolute offset of buf[0]
+        emitted_end = 0
+        for piece in pieces:
+            buf += piece
+            while len(buf) >= size:
+                cut = _break_at(buf, size)
+                yield base, buf[:cut]
+                emitted_end = base + cut
+                step = _overlap_start(buf, cut, overlap, size)
+                buf = buf[step:]
+                base += step
+        # the tail, unless it is only the overlap of the previous chunk
+        if buf and base + len(buf) > emitted_end:
+            yield base, buf
+
+    def _sentence_windows(self, pieces: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        window: Deque[str] = deque()
+        start = 0  # index of window[0]
+        fresh = 0  # sentences not yet emitted
+        for sentence in _iter_sentences(pieces, self.max_sentence_chars):
+            window.append(sentence)
+            fresh += 1
+            if len(window) == self.chunk_size:
+                yield start, " ".join(window)
+                fresh = 0
+                while len(window) > self.overlap:
+                    window.popleft()
+                    start += 1
+        if fresh:
+            yield start, " ".join(window)
+
+
+def _break_at(buf: str, size: int) -> int:
+    window = buf[:size]
+    idx = max(window.rfind(" "), window.rfind("\n"))
+    return idx + 1 if idx >= size // 2 else size
+
+
+def _overlap_start(buf: str, cut: int, overlap: int, size: int) -> int:
+    # a cut at whitespace can be shorter than the overlap: still advance by
+    # the configured stride (at most half the chunk) so windows keep moving
+    start = max(cut - overlap, min(cut // 2, size - overlap), 1)
+    # start the overlap on a word boundary rather than mid-word
+    if overlap and not buf[start - 1].isspace():
+        match = re.search(r"\s", buf[start:cut])
+        if match is not None:
+            start += match.end()
+    return start
+
+
+def _iter_sentences(pieces: Iterable[str], max_chars: int) -> Iterator[str]:
+    tail = ""  # unfinished sentence, at most max_chars long
+    for piece in pieces:
+        buf = tail + piece
+        start = 0
+        # only the new text can hold a boundary: tail has no complete one
+        for match in _SENTENCE_END.finditer(buf, len(tail)):
+            sentence = buf[start : match.start()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        tail = buf[start:]
+        # no terminator in sight (e.g. a log or a table): flush in bounded parts
+        while len(tail) > max_chars:
+            sentence = tail[:max_chars].strip()
+            if sentence:
+                yield sentence
+            tail = tail[max_chars:]
+    if tail.strip():
+        yield tail.strip()
+
+
+def _chunk_file(chunker: TextChunker, path: PathLike, encoding: str) -> List[Chunk]:
+    # module-level so that it can be pickled for the process pool
+    return list(chunker.chunk_file(path, encoding=encoding))
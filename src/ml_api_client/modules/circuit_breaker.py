@@ -0,0 +1,198 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..utils import route_family
+
+__all__ = [
+    "CircuitBreakerConfig",
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "CLOSED",
+    "OPEN",
+    "HALF_OPEN",
+]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+StateListener = Callable[[str, str, str], Any]
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """
+    Thresholds of the per-endpoint circuit breakers of APIClient.
+
+    window:             seconds of outcomes the rates are computed over
+    min_calls:          calls needed in the window before the breaker can trip
+    failure_rate:       share of failed calls (connection errors, timeouts,
+                        5xx) that opens the breaker
+    slow_call_duration: seconds after which a call counts as slow (None = off)
+    slow_call_rate:     share of slow calls that opens the breaker
+    open_for:           seconds calls fail fast before probing again
+    half_open_probes:   probes let through (and needed to succeed) to close
+    """
+
+    window: float = 30.0
+    min_calls: int = 10
+    failure_rate: float = 0.5
+    slow_call_duration: Optional[float] = None
+    slow_call_rate: float = 0.5
+    open_for: float = 30.0
+    half_open_probes: int = 3
+
+
+class CircuitBreaker:
+    """
+    Closed -> open when the error or slow-call rate over the window crosses
+    its threshold; open -> half-open after `open_for`; half-open lets a few
+    probes through and closes once they all succeed, or reopens on a failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: CircuitBreakerConfig,
+        on_state_change: Optional[StateListener] = None,
+    ) -> None:
+        self.name = name
+        self.config = config
+        self.state = CLOSED
+        self._on_state_change = on_state_change
+        # (timestamp, failed, slow) of recent calls
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        # counters
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    # --------------------------
+    # Admission
+    # --------------------------
+    def retry_after(self) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(self._opened_at + self.config.open_for - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """True when a call may go out; must be followed by record() or abandon()."""
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= self.config.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes += 1
+        return True
+
+    def abandon(self) -> None:
+        """The allowed call ended without an outcome (e.g. it was cancelled)."""
+        if self.state == HALF_OPEN and self._probes:
+            self._probes -= 1
+
+    # --------------------------
+    # Outcomes
+    # --------------------------
+    def record(self, failed: bool, duration: float) -> None:
+        config = self.config
+        slow = (
+            config.slow_call_duration is not None
+            and duration >= config.slow_call_duration
+        )
+        self.calls += 1
+        self.failures += failed
+        self.slow_calls += slow
+
+        if self.state == HALF_OPEN:
+            if failed or slow:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= config.half_open_probes:
+                self._transition(CLOSED)
+            return
+        if self.state == OPEN:
+            # late outcome of a call admitted before the breaker opened
+            return
+
+        now = time.monotonic()
+        outcomes = self._outcomes
+        outcomes.append((now, failed, slow))
+        while outcomes and outcomes[0][0] < now - config.window:
+            outcomes.popleft()
+        total = len(outcomes)
+        if total < config.min_calls:
+            return
+        failed_count = sum(1 for _, f, _ in outcomes if f)
+        slow_count = sum(1 for _, _, s in outcomes if s)
+        if (
+            failed_count / total >= config.failure_rate
+            or slow_count / total >= config.slow_call_rate
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._probes = 0
+        self._probe_successes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+        if self._on_state_change is not None:
+            self._on_state_change(self.name, previous, state)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "retry_after": self.retry_after(),
+        }
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per (host, route family), created on first use."""
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None) -> None:
+        self.config = config or CircuitBreakerConfig()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._listeners: List[StateListener] = []
+
+    def add_listener(self, listener: StateListener) -> None:
+        """Calls listener(name, old_state, new_state) on every state change."""
+        self._listeners.append(listener)
+
+    def _notify(self, name: str, old: str, new: str) -> None:
+        for listener in self._listeners:
+            listener(name, old, new)
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        name = f"{route_family(url)}@{urlsplit(url).netloc}"
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(
+                name, self.config, self._notify
+            )
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: b.stats() for name, b in self._breakers.items()}
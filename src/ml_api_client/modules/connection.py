@@ -0,0 +1,110 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+__all__ = ["ConnectorConfig", "PoolStats", "SharedConnectorPool"]
+
+
+# --------------------------
+# Connector configuration
+# --------------------------
+@dataclass(frozen=True)
+class ConnectorConfig:
+    """
+    Settings of the aiohttp connection pool used by APIClient.
+
+    limit:              max simultaneous connections (0 = unlimited)
+    limit_per_host:     max simultaneous connections to one host (0 = unlimited)
+    keepalive_timeout:  seconds an idle connection is kept open for reuse
+    ttl_dns_cache:      seconds DNS answers are cached (None = forever)
+    use_dns_cache:      disable to resolve on every new connection
+    enable_cleanup_closed: abort SSL transports the peer did not close cleanly
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: Optional[int] = 300
+    use_dns_cache: bool = True
+    enable_cleanup_closed: bool = False
+
+    def build(self) -> aiohttp.TCPConnector:
+        # Must be called from a running event loop.
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.use_dns_cache,
+            enable_cleanup_closed=self.enable_cleanup_closed,
+        )
+
+
+@dataclass
+class PoolStats:
+    limit: int
+    limit_per_host: int
+    in_use: int
+    idle: int
+    waiting: int
+
+    @classmethod
+    def from_connector(cls, connector: Optional[aiohttp.BaseConnector]) -> "PoolStats":
+        """
+        Snapshot of a connector's pool. aiohttp does not expose these counters
+        publicly, so read its bookkeeping defensively.
+        """
+        if connector is None or connector.closed:
+            return cls(limit=0, limit_per_host=0, in_use=0, idle=0, waiting=0)
+
+        acquired = getattr(connector, "_acquired", ())
+        conns = getattr(connector, "_conns", {}) or {}
+        waiters = getattr(connector, "_waiters", {}) or {}
+        return cls(
+            limit=connector.limit,
+            limit_per_host=connector.limit_per_host,
+            in_use=len(acquired),
+            idle=sum(len(v) for v in conns.values()),
+            waiting=sum(len(v) for v in waiters.values()),
+        )
+
+
+# --------------------------
+# Process-wide shared connectors
+# --------------------------
+class SharedConnectorPool:
+    """
+    Reference-counted connectors shared by every APIClient created with
+    share_connector=True and the same ConnectorConfig. Connectors are bound to
+    an event loop, so the loop is part of the key.
+    """
+
+    _connectors: Dict[
+        Tuple[ConnectorConfig, asyncio.AbstractEventLoop], aiohttp.TCPConnector
+    ] = {}
+    _refcounts: Dict[Tuple[ConnectorConfig, asyncio.AbstractEventLoop], int] = {}
+
+    @classmethod
+    def acquire(cls, config: ConnectorConfig) -> aiohttp.TCPConnector:
+        key = (config, asyncio.get_running_loop())
+        connector = cls._connectors.get(key)
+        if connector is None or connector.closed:
+            connector = config.build()
+            cls._connectors[key] = connector
+            cls._refcounts[key] = 0
+        cls._refcounts[key] += 1
+        return connector
+
+    @classmethod
+    async def release(cls, connector: aiohttp.BaseConnector) -> None:
+        for key, conn in list(cls._connectors.items()):
+            if conn is not connector:
+                continue
+            cls._refcounts[key] -= 1
+            if cls._refcounts[key] <= 0:
+                del cls._connectors[key]
+                del cls._refcounts[key]
+                await conn.close()
+            return
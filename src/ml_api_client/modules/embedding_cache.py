@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+__all__ = ["EmbeddingCache", "CacheStats"]
+
+_Key = Tuple[str, bytes]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_hits: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache keyed by (model, hash of text).
+
+    Vectors are kept as float32 arrays in a bounded in-memory LRU. When `path`
+    is given, they are also persisted to a SQLite file and entries evicted
+    from memory can be served (and promoted back) from disk. Disk access runs
+    in a worker thread so lookups don't block the event loop.
+    """
+
+    def __init__(self, max_entries: int = 10_000, path: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.path = path
+        self.stats = CacheStats()
+        self._lru: "OrderedDict[_Key, array]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, hash BLOB NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, hash))"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> _Key:
+        return model, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    # --------------------------
+    # Lookup / store
+    # --------------------------
+    async def get_many(
+        self, model: str, texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """Returns one vector per text, None for misses, in input order."""
+        keys = [self.key(model, t) for t in texts]
+        found: List[Optional[array]] = [self._lru_get(k) for k in keys]
+
+        missing = [i for i, v in enumerate(found) if v is None]
+        if missing and self._db is not None:
+            from_disk = await asyncio.to_thread(
+                self._db_get, model, [keys[i][1] for i in missing]
+            )
+            for i in missing:
+                vector = from_disk.get(keys[i][1])
+                if vector is not None:
+                    self.stats.disk_hits += 1
+                    self._lru_put(keys[i], vector)
+                    found[i] = vector
+
+        for v in found:
+            if v is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return [v.tolist() if v is not None else None for v in found]
+
+    async def put_many(
+        self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        rows = []
+        for text, vector in zip(texts, vectors, strict=True):
+            key = self.key(model, text)
+            packed = vector if isinstance(vector, array) else array("f", vector)
+            self._lru_put(key, packed)
+            rows.append((model, key[1], packed.tobytes()))
+        if rows and self._db is not None:
+            await asyncio.to_thread(self._db_put, rows)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        self.stats.size = 0
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # --------------------------
+    # Memory tier
+    # --------------------------
+    def _lru_get(self, key: _Key) -> Optional[array]:
+        vector = self._lru.get(key)
+        if vector is not None:
+            self._lru.move_to_end(key)
+        return vector
+
+    def _lru_put(self, key: _Key, vector: array) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.size = len(self._lru)
+
+    # --------------------------
+    # Disk tier
+    # --------------------------
+    def _db_get(self, model: str, hashes: List[bytes]) -> dict:
+        found = {}
+        with self._db_lock:
+            # stay under SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                part = hashes[start : start + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._db.execute(
+                    f"SELECT hash, vector FROM embeddings "
+                    f"WHERE model = ? AND hash IN ({marks})",
+                    [model, *part],
+                )
+                for h, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[h] = vector
+        return found
+
+    def _db_put(self, rows: List[Tuple[str, bytes, bytes]]) -> None:
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vector) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._db.commit()
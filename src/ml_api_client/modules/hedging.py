@@ -0,0 +1,141 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from .retry import RetryBudget
+
+__all__ = ["HedgeConfig", "HedgeStats", "LatencyTracker", "Hedger"]
+
+
+@dataclass(frozen=True)
+class HedgeConfig:
+    """
+    Settings of hedged requests (idempotent routes only).
+
+    percentile:     latency percentile of the route after which a second,
+                    identical request is started
+    initial_delay:  hedge delay until `min_samples` latencies are known
+    min_delay:      lower bound of the hedge delay, in seconds
+    max_hedges:     hedges in flight at once, client-wide
+    budget_ratio:   hedges allowed per request (0.1 = at most 10% extra load)
+    """
+
+    percentile: float = 0.95
+    initial_delay: float = 0.5
+    min_delay: float = 0.005
+    min_samples: int = 20
+    max_hedges: int = 8
+    budget_ratio: float = 0.1
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0
+    # hedges that answered before the original request
+    hedge_wins: int = 0
+    # hedges skipped because of max_hedges or the budget
+    suppressed: int = 0
+
+
+class LatencyTracker:
+    """Recent latencies of one route, with a cached percentile."""
+
+    def __init__(self, size: int = 256, refresh_every: int = 16) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._sorted: List[float] = []
+        self._refresh_every = refresh_every
+        self._dirty = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+        self._dirty += 1
+
+    def percentile(self, p: float) -> float:
+        if self._dirty >= self._refresh_every or not self._sorted:
+            self._sorted = sorted(self._samples)
+            self._dirty = 0
+        if not self._sorted:
+            return 0.0
+        index = min(int(p * len(self._sorted)), len(self._sorted) - 1)
+        return self._sorted[index]
+
+
+class Hedger:
+    """
+    Runs a request and, if it hasn't answered within the route's latency
+    percentile, an identical second one: the first answer wins and the other
+    is cancelled. A failed attempt doesn't win while the other is running.
+    """
+
+    def __init__(self, config: Optional[HedgeConfig] = None) -> None:
+        self.config = config or HedgeConfig()
+        self.stats = HedgeStats()
+        self._budget = RetryBudget(ratio=self.config.budget_ratio, reserve=1.0)
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._in_flight = 0
+
+    def delay(self, route: str) -> float:
+        config = self.config
+        tracker = self._latencies.get(route)
+        if tracker is None or len(tracker) < config.min_samples:
+            return config.initial_delay
+        return max(tracker.percentile(config.percentile), config.min_delay)
+
+    def _record(self, route: str, latency: float) -> None:
+        tracker = self._latencies.get(route)
+        if tracker is None:
+            tracker = self._latencies[route] = LatencyTracker()
+        tracker.add(latency)
+
+    async def run(self, route: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats.requests += 1
+        self._budget.deposit()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.delay(route))
+        except BaseException:
+            primary.cancel()
+            raise
+        if done:
+            result = primary.result()
+            self._record(route, time.monotonic() - started)
+            return result
+
+        if self._in_flight >= self.config.max_hedges or not self._budget.withdraw():
+            self.stats.suppressed += 1
+            result = await primary
+            self._record(route, time.monotonic() - started)
+            return result
+
+        self.stats.hedged += 1
+        self._in_flight += 1
+        hedge = asyncio.ensure_future(call())
+        pending = {primary, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                succeeded = [t for t in done if t.exception() is None]
+                winner = succeeded[0] if succeeded else None
+                if winner is not None or not pending:
+                    break
+            if winner is None:
+                # both failed: surface the original request's error
+                return primary.result()
+            if winner is hedge:
+                self.stats.hedge_wins += 1
+            self._record(route, time.monotonic() - started)
+            return winner.result()
+        finally:
+            self._in_flight -= 1
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
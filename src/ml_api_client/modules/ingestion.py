@@ -0,0 +1,128 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from ..utils import as_async_iterable
+
+__all__ = ["IngestResult", "IngestCheckpoint", "ChunkInput"]
+
+# A chunk is its text, optionally paired with its metadata
+ChunkInput = Union[str, Tuple[str, Dict[str, Any]]]
+
+
+@dataclass
+class IngestResult:
+    vector_store_id: str
+    chunks_added: int = 0
+    chunks_sent: int = 0
+    batches_done: int = 0
+    batches_skipped: int = 0
+    retries: int = 0
+
+
+@dataclass
+class IngestCheckpoint:
+    """
+    Records which batches of an ingest succeeded, so that re-running the same
+    ingest (same input order and batch limits) skips them. Saved as JSON
+    after each batch when `path` is set.
+    """
+
+    path: Optional[str] = None
+    vector_store_id: Optional[str] = None
+    batch_limits: Optional[List[int]] = None
+    completed: Set[int] = field(default_factory=set)
+    chunks_added: int = 0
+
+    @classmethod
+    def load(cls, path: str) -> "IngestCheckpoint":
+        if not os.path.exists(path):
+            return cls(path=path)
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        return cls(
+            path=path,
+            vector_store_id=raw.get("vector_store_id"),
+            batch_limits=raw.get("batch_limits"),
+            completed=set(raw.get("completed", [])),
+            chunks_added=raw.get("chunks_added", 0),
+        )
+
+    def bind(self, vector_store_id: str, batch_limits: List[int]) -> None:
+        """Refuses to resume a checkpoint written for another store or batching."""
+        if self.vector_store_id is None:
+            self.vector_store_id = vector_store_id
+            self.batch_limits = batch_limits
+            return
+        if self.vector_store_id != vector_store_id or self.batch_limits != batch_limits:
+            raise ValueError(
+                "Checkpoint was written for a different vector store or batch limits"
+            )
+
+    def mark_done(self, seq: int, chunks_added: int) -> None:
+        self.completed.add(seq)
+        self.chunks_added += chunks_added
+        self.save()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "vector_store_id": self.vector_store_id,
+                    "batch_limits": self.batch_limits,
+                    "completed": sorted(self.completed),
+                    "chunks_added": self.chunks_added,
+                },
+                f,
+            )
+        # atomic: an interrupted write never corrupts the previous checkpoint
+        os.replace(tmp, self.path)
+
+
+def split_chunk(item: ChunkInput) -> Tuple[str, Dict[str, Any]]:
+    if isinstance(item, str):
+        return item, {}
+    text, metadata = item
+    return text, dict(metadata or {})
+
+
+async def iter_batches(
+    chunks: Union[Iterable[ChunkInput], AsyncIterable[ChunkInput]],
+    max_chunks: int,
+    max_bytes: int,
+) -> AsyncIterator[Tuple[int, List[str], List[Dict[str, Any]]]]:
+    """
+    Reads chunks lazily and yields (seq, texts, metadata) batches bounded by
+    chunk count and approximate JSON body size.
+    """
+    seq = 0
+    texts: List[str] = []
+    metas: List[Dict[str, Any]] = []
+    size = 0
+    async for item in as_async_iterable(chunks):
+        text, meta = split_chunk(item)
+        cost = len(text.encode("utf-8")) + (len(json.dumps(meta)) if meta else 2)
+        if texts and (len(texts) >= max_chunks or size + cost > max_bytes):
+            yield seq, texts, metas
+            seq += 1
+            texts, metas, size = [], [], 0
+        texts.append(text)
+        metas.append(meta)
+        size += cost
+    if texts:
+        yield seq, texts, metas
@@ -0,0 +1,254 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+
+try:
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import trace as otel_trace
+except ImportError:  # optional dependency
+    otel_metrics = otel_trace = None
+
+__all__ = [
+    "Event",
+    "Instrumentation",
+    "RequestTrace",
+    "StreamTrace",
+    "OpenTelemetryListener",
+]
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[["Event"], Any]
+
+
+@dataclass
+class Event:
+    """
+    One instrumentation event.
+
+    name: "request", "stream", "retry", "token_refresh", "validation" (tool
+    arguments), "construct" (response models) or "circuit_state"; attributes
+    hold the event's fields (durations in seconds).
+    """
+
+    name: str
+    attributes: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+
+class RequestTrace:
+    """
+    Per-attempt phase timings of one HTTP request. The aiohttp TraceConfig of
+    the client fills the connection phases through `trace_request_ctx`.
+
+    Phases: queue_wait (admission control), connection_queued (waiting for a
+    pooled connection), dns, connection_create (TCP + TLS), ttfb (headers sent
+    to response headers), body_read, json_decode.
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "family",
+        "attempt",
+        "phases",
+        "start",
+        "finished",
+        "_marks",
+    )
+
+    def __init__(self, method: str, url: str, family: str) -> None:
+        self.method = method
+        self.url = url
+        self.family = family
+        self.attempt = 0
+        self.phases: Dict[str, float] = {}
+        self.start = 0.0
+        self.finished = False
+        self._marks: Dict[str, float] = {}
+
+    def begin_attempt(self) -> None:
+        self.attempt += 1
+        self.phases = {}
+        self._marks = {}
+        self.start = time.perf_counter()
+        self.finished = False
+
+    def mark(self, name: str) -> None:
+        self._marks[name] = time.perf_counter()
+
+    def close(self, name: str) -> None:
+        started = self._marks.pop(name, None)
+        if started is not None:
+            self.phases[name] = time.perf_counter() - started
+
+    def finish(self, **extra: Any) -> Optional[Dict[str, Any]]:
+        """Attributes of the current attempt, the first time only."""
+        if self.finished:
+            return None
+        self.finished = True
+        return self.attributes(**extra)
+
+    def attributes(self, **extra: Any) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "family": self.family,
+            "attempt": self.attempt,
+            "duration": time.perf_counter() - self.start,
+            "phases": dict(self.phases),
+            **extra,
+        }
+
+
+class StreamTrace:
+    """Time-to-first-token and inter-chunk gaps of one SSE stream."""
+
+    __slots__ = ("start", "last", "ttft", "gaps")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.last: Optional[float] = None
+        self.ttft: Optional[float] = None
+        self.gaps: List[float] = []
+
+    def chunk(self) -> None:
+        now = time.perf_counter()
+        if self.last is None:
+            self.ttft = now - self.start
+        else:
+            self.gaps.append(now - self.last)
+        self.last = now
+
+    def attributes(self, **extra: Any) -> Dict[str, Any]:
+        gaps = self.gaps
+        return {
+            "ttft": self.ttft,
+            "chunks": len(gaps) + (self.last is not None),
+            "gaps": gaps,
+            "max_gap": max(gaps) if gaps else None,
+            "mean_gap": sum(gaps) / len(gaps) if gaps else None,
+            "duration": time.perf_counter() - self.start,
+            **extra,
+        }
+
+
+class Instrumentation:
+    """
+    Event hooks of an APIClient. Requests are only traced while a listener
+    is registered (call sites check `enabled` first); otherwise the aiohttp
+    trace callbacks return immediately and nothing is timed or allocated.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: List[Listener] = []
+        self.enabled = False
+
+    def add_listener(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+        self.enabled = True
+
+    def remove_listener(self, listener: Listener) -> None:
+        self._listeners.remove(listener)
+        self.enabled = bool(self._listeners)
+
+    def emit(self, name: str, **attributes: Any) -> None:
+        if not self._listeners:
+            return
+        event = Event(name, attributes)
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception:
+                # a broken listener must never fail the request
+                logger.exception("Instrumentation listener failed on '%s'", name)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """TraceConfig filling the RequestTrace passed as trace_request_ctx."""
+        config = aiohttp.TraceConfig()
+
+        def opener(mark: str):
+            async def on_start(session, ctx: SimpleNamespace, params) -> None:
+                if ctx.trace_request_ctx is not None:
+                    ctx.trace_request_ctx.mark(mark)
+
+            return on_start
+
+        def closer(phase: str):
+            async def on_end(session, ctx: SimpleNamespace, params) -> None:
+                if ctx.trace_request_ctx is not None:
+                    ctx.trace_request_ctx.close(phase)
+
+            return on_end
+
+        config.on_connection_queued_start.append(opener("connection_queued"))
+        config.on_connection_queued_end.append(closer("connection_queued"))
+        config.on_dns_resolvehost_start.append(opener("dns"))
+        config.on_dns_resolvehost_end.append(closer("dns"))
+        config.on_connection_create_start.append(opener("connection_create"))
+        config.on_connection_create_end.append(closer("connection_create"))
+        config.on_request_headers_sent.append(opener("ttfb"))
+        config.on_request_end.append(closer("ttfb"))
+        config.freeze()
+        return config
+
+
+# --------------------------
+# OpenTelemetry adapter
+# --------------------------
+class OpenTelemetryListener:
+    """
+    Turns "request" and "stream" events into spans (with the phases as
+    attributes) and every phase into a duration histogram. Register it with
+    client.events.add_listener(OpenTelemetryListener()).
+
+    Requires opentelemetry-api (pip install ml_api_client[otel]).
+    """
+
+    def __init__(self, tracer: Any = None, meter: Any = None) -> None:
+        if otel_trace is None:
+            raise ImportError(
+                "OpenTelemetryListener requires opentelemetry-api: "
+                "pip install ml_api_client[otel]"
+            )
+        self.tracer = tracer or otel_trace.get_tracer("ml_api_client")
+        meter = meter or otel_metrics.get_meter("ml_api_client")
+        self.durations = meter.create_histogram(
+            "ml_api_client.duration", unit="s", description="Request phase durations"
+        )
+        self.events = meter.create_counter(
+            "ml_api_client.events", description="Retries, refreshes, state changes"
+        )
+
+    def __call__(self, event: Event) -> None:
+        attrs = event.attributes
+        if event.name not in ("request", "stream"):
+            self.events.add(
+                1,
+                {"event": event.name, "family": str(attrs.get("family", ""))},
+            )
+            return
+
+        labels = {"event": event.name, "family": str(attrs.get("family", ""))}
+        end_ns = int(event.timestamp * 1e9)
+        span = self.tracer.start_span(
+            f"ml_api_client.{event.name}",
+            start_time=end_ns - int(attrs.get("duration", 0.0) * 1e9),
+        )
+        for key, value in attrs.items():
+            if isinstance(value, (str, bool, int, float)):
+                span.set_attribute(key, value)
+        phases = attrs.get("phases") or {}
+        if event.name == "stream":
+            phases = {"ttft": attrs.get("ttft"), "max_gap": attrs.get("max_gap")}
+        for phase, value in phases.items():
+            if value is None:
+                continue
+            span.set_attribute(f"phase.{phase}", value)
+            self.durations.record(value, {**labels, "phase": phase})
+        self.durations.record(attrs.get("duration", 0.0), {**labels, "phase": "total"})
+        span.end(end_time=end_ns)
@@ -0,0 +1,256 @@
+import json
+import os
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from ..models import CreateVectorStoreRequest, EmbeddingsRequest
+from .embedding_cache import EmbeddingCache
+from .ingestion import ChunkInput, split_chunk
+from .vectors import np
+
+__all__ = ["LocalVectorIndex"]
+
+_DISTANCES = {"cosine": "Cosine", "euclidean": "Euclid", "euclid": "Euclid"}
+
+
+class LocalVectorIndex:
+    """
+    In-process replica of a (small, hot) vector store.
+
+    The server exposes no endpoint to export stored vectors, so the replica is
+    built by embedding the store's chunks through EmbeddingsEndpoint with the
+    store's embedding model. Vectors live in one float32 matrix, memory-mapped
+    from `path` when given, and searches run as a vectorized top-k using the
+    store's distance (Cosine: similarity, higher is better; Euclidean:
+    distance, lower is better, as the server reports them).
+
+    Attach it with client.vector_stores.attach_replica(index): searches on the
+    store are then answered locally while the replica is fresh, and go to the
+    server when it is not built, older than `max_age` seconds, or marked stale
+    (which writes to the store through the client do automatically).
+
+    Query embeddings are kept in `query_cache` (an in-memory EmbeddingCache
+    unless one is given), so a repeated query is answered without any network
+    round trip; callers holding the query vector can pass it directly.
+
+    Requires numpy (pip install ml_api_client[numpy]).
+    """
+
+    def __init__(
+        self,
+        client,
+        vector_store_id: str,
+        embedding_model: str,
+        distance: Optional[str] = "Cosine",
+        path: Optional[str] = None,
+        max_age: Optional[float] = None,
+        query_cache: Optional[EmbeddingCache] = None,
+        query_cache_size: int = 1024,
+    ) -> None:
+        if np is None:
+            raise ImportError(
+                "LocalVectorIndex requires numpy: pip install ml_api_client[numpy]"
+            )
+        kind = _DISTANCES.get((distance or "Cosine").lower())
+        if kind is None:
+            raise ValueError(f"Unsupported distance for a local replica: {distance}")
+        self.client = client
+        self.vector_store_id = vector_store_id
+        self.embedding_model = embedding_model
+        self.distance = kind
+        self.path = path
+        self.max_age = max_age
+        self.built_at: Optional[float] = None
+        self.stale = False
+        self.texts: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self._matrix: Any = None
+        self._sq_norms: Any = None
+        self.query_cache = query_cache or EmbeddingCache(max_entries=query_cache_size)
+
+    @classmethod
+    def from_create_request(
+        cls, client, vector_store_id: str, request: CreateVectorStoreRequest, **kwargs
+    ) -> "LocalVectorIndex":
+        return cls(
+            client,
+            vector_store_id,
+            embedding_model=request.embedding_model,
+            distance=request.distance,
+            **kwargs,
+        )
+
+    # --------------------------
+    # State
+    # --------------------------
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def is_fresh(self) -> bool:
+        if self._matrix is None or self.stale:
+            return False
+        if self.max_age is not None and self.built_at is not None:
+            return time.monotonic() - self.built_at <= self.max_age
+        return True
+
+    def mark_stale(self) -> None:
+        self.stale = True
+
+    # --------------------------
+    # Build / load
+    # --------------------------
+    async def build(
+        self,
+        chunks: Union[Iterable[ChunkInput], AsyncIterable[ChunkInput]],
+        batch_size: int = 128,
+        max_concurrency: int = 4,
+    ) -> None:
+        """(Re)builds the replica from the chunks ingested in the store."""
+        texts: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        if isinstance(chunks, AsyncIterable):
+            async for item in chunks:
+                text, meta = split_chunk(item)
+                texts.append(text)
+                metadata.append(meta)
+        else:
+            for item in chunks:
+                text, meta = split_chunk(item)
+                texts.append(text)
+                metadata.append(meta)
+
+        rows: List[Any] = []
+        sink = open(self.path, "wb") if self.path else None
+        try:
+            async for data in self.client.embeddings.embed_many(
+                texts,
+                self.embedding_model,
+                batch_size=batch_size,
+                max_concurrency=max_concurrency,
+            ):
+                row = np.asarray(data.embedding, dtype=np.float32)
+                if sink is not None:
+                    sink.write(row.tobytes())
+                else:
+                    rows.append(row)
+        finally:
+            if sink is not None:
+                sink.close()
+
+        if self.path:
+            dim = os.path.getsize(self.path) // 4 // max(len(texts), 1)
+            self._save_meta(texts, metadata, dim)
+            matrix = self._open_memmap(len(texts), dim)
+        else:
+            matrix = np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+        self._install(matrix, texts, metadata)
+
+    @classmethod
+    def load(
+        cls, client, vector_store_id: str, path: str, **kwargs
+    ) -> "LocalVectorIndex":
+        """Reopens a replica previously built with `path`, without re-embedding."""
+        with open(f"{path}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(
+            client,
+            vector_store_id,
+            embedding_model=meta["embedding_model"],
+            distance=meta["distance"],
+            path=path,
+            **kwargs,
+        )
+        matrix = index._open_memmap(len(meta["texts"]), meta["dim"])
+        index._install(matrix, meta["texts"], meta["metadata"])
+        return index
+
+    def _open_memmap(self, rows: int, dim: int) -> Any:
+        if rows == 0 or dim == 0:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.memmap(self.path, dtype=np.float32, mode="r", shape=(rows, dim))
+
+    def _save_meta(
+        self, texts: List[str], metadata: List[Dict[str, Any]], dim: int
+    ) -> None:
+        with open(f"{self.path}.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "embedding_model": self.embedding_model,
+                    "distance": self.distance,
+                    "dim": dim,
+                    "texts": texts,
+                    "metadata": metadata,
+                },
+                f,
+            )
+
+    def _install(
+        self, matrix: Any, texts: List[str], metadata: List[Dict[str, Any]]
+    ) -> None:
+        self._matrix = matrix
+        self._sq_norms = np.einsum("ij,ij->i", matrix, matrix) if len(texts) else None
+        self.texts = texts
+        self.metadata = metadata
+        self.built_at = time.monotonic()
+        self.stale = False
+
+    # --------------------------
+    # Search
+    # --------------------------
+    async def search(
+        self, query: str, limit: int = 5, vector: Any = None
+    ) -> Dict[str, Any]:
+        if vector is None:
+            vector = await self.embed_query(query)
+        return self.search_vector(vector, limit)
+
+    async def embed_query(self, query: str) -> Any:
+        """Query vector, from query_cache or embedded with the store's model."""
+        cached = await self.query_cache.get_many(self.embedding_model, [query])
+        if cached[0] is not None:
+            return np.asarray(cached[0], dtype=np.float32)
+        matrix = await self.client.embeddings.get_embeddings_matrix(
+            EmbeddingsRequest(input=[query], model=self.embedding_model)
+        )
+        vector = np.asarray(matrix.row(0), dtype=np.float32)
+        await self.query_cache.put_many(self.embedding_model, [query], [vector])
+        return vector
+
+    def search_vector(self, vector: Any, limit: int = 5) -> Dict[str, Any]:
+        """Top-k over the replica for an already embedded query."""
+        if not len(self):
+            return {"data": []}
+        q = np.asarray(vector, dtype=np.float32)
+        dots = self._matrix @ q
+        if self.distance == "Cosine":
+            denom = np.sqrt(self._sq_norms) * float(np.linalg.norm(q))
+            scores = dots / np.where(denom == 0, 1.0, denom)
+            order = -scores
+        else:
+            sq = np.maximum(self._sq_norms - 2.0 * dots + float(q @ q), 0.0)
+            scores = np.sqrt(sq)
+            order = scores
+
+        k = min(limit, len(self))
+        top = np.argpartition(order, k - 1)[:k] if k < len(self) else np.arange(k)
+        top = top[np.argsort(order[top], kind="stable")]
+        return {
+            "data": [
+                {
+                    "id": str(i),
+                    "score": float(scores[i]),
+                    "text": self.texts[i],
+                    "metadata": self.metadata[i],
+                }
+                for i in top.tolist()
+            ]
+        }
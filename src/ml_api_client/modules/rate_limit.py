@@ -0,0 +1,250 @@
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from ..utils import estimate_text_tokens
+
+__all__ = ["RateLimit", "TokenBucket", "AdmissionController", "estimate_tokens"]
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Budget of one endpoint family ("chat", "embeddings", "vector_stores",
+    "default"). None disables the corresponding limit.
+    """
+
+    requests_per_second: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_in_flight: Optional[int] = None
+
+
+class TokenBucket:
+    """
+    Classic token bucket. A request larger than the bucket is let through once
+    the bucket is full and leaves it in debt, so it can never block forever.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        needed = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= needed:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((needed - self.tokens) / self.rate)
+
+
+class _FamilyBudget:
+    def __init__(self, limit: RateLimit) -> None:
+        self.limit = limit
+        self.semaphore = (
+            asyncio.Semaphore(limit.max_in_flight) if limit.max_in_flight else None
+        )
+        self.requests = (
+            TokenBucket(limit.requests_per_second)
+            if limit.requests_per_second
+            else None
+        )
+        self.tokens = (
+            TokenBucket(limit.tokens_per_minute / 60.0, limit.tokens_per_minute)
+            if limit.tokens_per_minute
+            else None
+        )
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.throttled = 0
+
+
+class AdmissionController:
+    """
+    Client-wide admission control: a global max-in-flight semaphore, plus a
+    per-family concurrency cap, requests-per-second bucket and tokens-per-minute
+    bucket. Response headers (Retry-After, x-ratelimit-*) pause a family until
+    the server's window resets, and a 429 halves its request rate, which then
+    recovers additively on successes (AIMD), so bursts slow down smoothly.
+    Without such headers nothing is paused: one transient error must not stall
+    every caller of the family, the retry policy backs off the request itself.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        limits: Optional[Mapping[str, RateLimit]] = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.limits: Dict[str, RateLimit] = dict(limits or {})
+        self._global = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self._budgets: Dict[str, _FamilyBudget] = {}
+
+    def _budget(self, family: str) -> _FamilyBudget:
+        budget = self._budgets.get(family)
+        if budget is None:
+            limit = self.limits.get(family) or self.limits.get("default") or RateLimit()
+            budget = self._budgets[family] = _FamilyBudget(limit)
+        return budget
+
+    def charges_tokens(self, family: str) -> bool:
+        return self._budget(family).tokens is not None
+
+    # --------------------------
+    # Admission
+    # --------------------------
+    async def acquire(self, family: str, tokens: float = 0.0) -> Callable[[], None]:
+        """Waits for a slot; returns the callable that releases it."""
+        budget = self._budget(family)
+        delay = budget.paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._global is not None:
+            await self._global.acquire()
+        try:
+            if budget.semaphore is not None:
+                await budget.semaphore.acquire()
+            try:
+                if budget.requests is not None:
+                    await budget.requests.acquire()
+                if budget.tokens is not None and tokens:
+                    await budget.tokens.acquire(tokens)
+            except BaseException:
+                if budget.semaphore is not None:
+                    budget.semaphore.release()
+                raise
+        except BaseException:
+            if self._global is not None:
+                self._global.release()
+            raise
+
+        budget.in_flight += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            budget.in_flight -= 1
+            if budget.semaphore is not None:
+                budget.semaphore.release()
+            if self._global is not None:
+                self._global.release()
+
+        return release
+
+    # --------------------------
+    # Feedback from responses
+    # --------------------------
+    def observe(self, family: str, status: int, headers: Mapping[str, str]) -> float:
+        """Feeds a response back; returns the pause it imposed (0 if none)."""
+        budget = self._budget(family)
+        now = time.monotonic()
+        pause = 0.0
+
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        if status in (429, 503) and retry_after is not None:
+            pause = retry_after
+        for kind in ("requests", "tokens"):
+            if headers.get(f"x-ratelimit-remaining-{kind}") == "0":
+                reset = _parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset is not None:
+                    pause = max(pause, reset)
+        if pause:
+            budget.paused_until = max(budget.paused_until, now + pause)
+
+        bucket = budget.requests
+        configured = budget.limit.requests_per_second
+        if status == 429:
+            budget.throttled += 1
+            if bucket is not None and configured:
+                bucket.rate = max(bucket.rate * 0.5, configured * 0.1)
+        elif bucket is not None and configured and 200 <= status < 300:
+            if bucket.rate < configured:
+                bucket.rate = min(configured, bucket.rate + configured * 0.05)
+        return pause
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        return {
+            family: {
+                "in_flight": b.in_flight,
+                "throttled": b.throttled,
+                "requests_per_second": b.requests.rate if b.requests else None,
+                "paused_for": max(b.paused_until - now, 0.0),
+            }
+            for family, b in self._budgets.items()
+        }
+
+
+# --------------------------
+# Helpers
+# --------------------------
+def estimate_tokens(body: Any) -> float:
+    """Approximate token cost of a JSON request body (prompt + max output)."""
+    if not isinstance(body, dict):
+        return 0.0
+    texts: List[str] = []
+    inputs = body.get("input")
+    if isinstance(inputs, str):
+        texts.append(inputs)
+    elif isinstance(inputs, list):
+        texts += (t for t in inputs if isinstance(t, str))
+    for message in body.get("messages") or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            texts.append(content)
+        elif isinstance(content, list):
+            texts += (
+                part.get("text", "") for part in content if isinstance(part, dict)
+            )
+    max_out = body.get("max_completion_tokens") or body.get("max_tokens") or 0
+    return float(sum(estimate_text_tokens(t) for t in texts) + max_out)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parses x-ratelimit-reset-* values such as "1s", "6m0s" or "20ms"."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(n) * _UNITS[unit] for n, unit in parts)
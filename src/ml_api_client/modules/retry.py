@@ -0,0 +1,119 @@
+import random
+import time
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional, Tuple, Type
+
+__all__ = ["RetryPolicy", "RetryBudget", "RetryStats"]
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    retries: int = 0
+    # retries refused by the budget or the deadline
+    denied: int = 0
+
+
+class RetryBudget:
+    """
+    Client-wide cap on retry load. Every request deposits `ratio` tokens and
+    every retry withdraws one, so retries stay below `ratio` of the traffic
+    (plus a small `reserve` so a quiet client can still retry).
+    """
+
+    def __init__(self, ratio: float = 0.1, reserve: float = 10.0) -> None:
+        if ratio < 0 or reserve < 0:
+            raise ValueError("ratio and reserve must be >= 0")
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = reserve
+        # deposits can't build an unbounded backlog of retries
+        self.cap = max(reserve, 1.0) * 10
+
+    def deposit(self) -> None:
+        self.balance = min(self.cap, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1.0:
+            return False
+        self.balance -= 1.0
+        return True
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Single retry policy used by every request of an APIClient.
+
+    Retries responses whose status is in `retry_statuses` and the client's
+    ConnectionError / TimeoutError (or any `retry_exceptions`), up to
+    `max_attempts` attempts in total. Delays use decorrelated jitter between
+    `base_delay` and `max_delay`; no retry starts after `deadline` seconds
+    from the first attempt, and the shared RetryBudget bounds the extra load.
+    401 token refreshes are handled separately and don't count here.
+
+    Only requests whose method is in `idempotent_methods`, or that opt in per
+    call, are replayed after a 5xx or a transport error: a write may already
+    have been committed. A 429 (rejected, never processed) is always retried.
+    """
+
+    max_attempts: int = 4
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_exceptions: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError)
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    deadline: Optional[float] = 120.0
+    # PUT appends chunks on this API, so it is not idempotent here
+    idempotent_methods: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+    budget: Optional[RetryBudget] = field(default_factory=RetryBudget)
+    stats: RetryStats = field(default_factory=RetryStats)
+
+    def begin(self, idempotent: bool = True) -> "RetryState":
+        self.stats.requests += 1
+        if self.budget is not None:
+            self.budget.deposit()
+        return RetryState(self, idempotent)
+
+
+class RetryState:
+    """Retry bookkeeping of one request (its own attempts, delay and deadline)."""
+
+    def __init__(self, policy: RetryPolicy, idempotent: bool = True) -> None:
+        self.policy = policy
+        self.idempotent = idempotent
+        self.attempts = 1
+        self.started = time.monotonic()
+        self._delay = policy.base_delay
+
+    def should_retry_status(self, status: int) -> bool:
+        if status != 429 and not self.idempotent:
+            return False
+        return status in self.policy.retry_statuses and self._may_retry()
+
+    def should_retry_exception(self, exc: BaseException) -> bool:
+        # the request may have reached the server before the error
+        if not self.idempotent:
+            return False
+        return isinstance(exc, self.policy.retry_exceptions) and self._may_retry()
+
+    def next_delay(self) -> float:
+        """Decorrelated jitter: uniform(base, 3 * previous), capped."""
+        policy = self.policy
+        self._delay = min(
+            policy.max_delay, random.uniform(policy.base_delay, self._delay * 3)
+        )
+        return self._delay
+
+    def _may_retry(self) -> bool:
+        policy = self.policy
+        if self.attempts >= policy.max_attempts:
+            return False
+        if (
+            policy.deadline is not None
+            and time.monotonic() - self.started >= policy.deadline
+        ) or (policy.budget is not None and not policy.budget.withdraw()):
+            policy.stats.denied += 1
+            return False
+        self.attempts += 1
+        policy.stats.retries += 1
+        return True
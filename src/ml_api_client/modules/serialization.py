@@ -0,0 +1,179 @@
+import functools
+import json
+import re
+from typing import Any, Callable, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+__all__ = [
+    "JSONCodec",
+    "JSONFragment",
+    "JSONStreamBuffer",
+    "get_codec",
+    "available_codecs",
+]
+
+
+class JSONFragment:
+    """
+    Already encoded JSON value (e.g. the cached tools payload). Placed at the
+    top level of a request body, JSONCodec.dumps_body() splices it verbatim.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded: bytes) -> None:
+        self.encoded = encoded
+
+    def __repr__(self) -> str:
+        return f"JSONFragment({len(self.encoded)} bytes)"
+
+
+class JSONCodec:
+    """
+    JSON encoder/decoder pair used by APIClient for request bodies, response
+    decoding, SSE chunks and tool results. `dumps` returns compact UTF-8 bytes
+    (non-ASCII characters are not escaped); `loads` accepts bytes or str.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[Union[bytes, str]], Any],
+    ) -> None:
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def dumps_str(self, obj: Any) -> str:
+        return self.dumps(obj).decode("utf-8")
+
+    def dumps_body(self, body: Any) -> bytes:
+        """dumps() of a request body, splicing its top-level JSONFragment values."""
+        if not isinstance(body, dict) or not any(
+            isinstance(v, JSONFragment) for v in body.values()
+        ):
+            return self.dumps(body)
+        rest = {k: v for k, v in body.items() if not isinstance(v, JSONFragment)}
+        parts = [self.dumps(rest)[:-1]]  # without the closing brace
+        for key, value in body.items():
+            if isinstance(value, JSONFragment):
+                if len(parts) > 1 or rest:
+                    parts.append(b",")
+                parts += (self.dumps(key), b":", value.encoded)
+        parts.append(b"}")
+        return b"".join(parts)
+
+    def __repr__(self) -> str:
+        return f"JSONCodec({self.name!r})"
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _codec(name: str) -> Optional[JSONCodec]:
+    if name == "orjson" and orjson is not None:
+        # non-str keys (e.g. a tool result {1: "a"}) are stringified like json.dumps
+        dumps = functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+        return JSONCodec("orjson", dumps, orjson.loads)
+    if name == "msgspec" and msgspec is not None:
+        encoder = msgspec.json.Encoder()
+        decoder = msgspec.json.Decoder()
+        return JSONCodec("msgspec", encoder.encode, decoder.decode)
+    if name == "json":
+        return JSONCodec("json", _stdlib_dumps, json.loads)
+    return None
+
+
+def available_codecs() -> List[str]:
+    return [name for name in ("orjson", "msgspec", "json") if _codec(name)]
+
+
+def get_codec(codec: Union[None, str, JSONCodec] = None) -> JSONCodec:
+    """
+    Resolves a codec: None picks the fastest installed one (orjson, then
+    msgspec, then the standard library); a name requires that library.
+    Install the fast path with `pip install ml_api_client[orjson]`.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return _codec(available_codecs()[0])
+    resolved = _codec(codec)
+    if resolved is None:
+        raise ImportError(f"JSON codec '{codec}' is not available")
+    return resolved
+
+
+# --------------------------
+# Incremental parsing of streamed JSON
+# --------------------------
+# characters that change the nesting or string state; everything else is skipped
+_STRUCTURAL = re.compile(r'[\\"{}\[\]]')
+
+
+class JSONStreamBuffer:
+    """
+    Accumulates a JSON document streamed in text fragments (e.g. the
+    `arguments` of a streamed tool call). Fragments are kept in a list and
+    joined once; each feed() only scans the new fragment for structural
+    characters, so completion of the top-level object or array is known as
+    soon as its closing bracket arrives.
+    """
+
+    __slots__ = ("_parts", "_depth", "_in_string", "_escape", "_started", "complete")
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self.complete = False
+
+    def feed(self, fragment: str) -> bool:
+        """Adds a fragment; returns True once the top-level value is closed."""
+        self._parts.append(fragment)
+        if self.complete:
+            return True
+        # an escape carried over from the previous fragment skips its first char
+        skip = 0 if self._escape else -1
+        self._escape = False
+        for match in _STRUCTURAL.finditer(fragment):
+            i = match.start()
+            if i == skip:
+                continue
+            char = match.group()
+            if self._in_string:
+                if char == "\\":
+                    skip = i + 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                self._started = True
+            else:
+                self._depth -= 1
+                if self._started and self._depth == 0:
+                    self.complete = True
+                    break
+        if skip == len(fragment):
+            self._escape = True
+        return self.complete
+
+    def text(self) -> str:
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
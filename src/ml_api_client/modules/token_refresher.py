@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import json
+import time
+from typing import Any, Dict, Optional
+
+__all__ = ["TokenRefresher"]
+
+
+class TokenRefresher:
+    """
+    Single-flight token refresh for an APIClient.
+
+    Concurrent callers that see a 401 (or a token about to expire) all wait on
+    one in-flight login instead of each logging in on its own. The token
+    lifetime is read from the /auth/token response (`expires_in`, in seconds)
+    or, failing that, from the JWT `exp` claim.
+    """
+
+    def __init__(
+        self,
+        client,
+        expires_in: int = 1,
+        refresh_margin: float = 0.1,
+        max_refresh_margin: float = 60.0,
+    ) -> None:
+        self.client = client
+        # lifetime requested from /auth/token on refresh
+        self.expires_in = expires_in
+        # refresh this fraction of the lifetime before expiry (capped)
+        self.refresh_margin = refresh_margin
+        self.max_refresh_margin = max_refresh_margin
+        self.refresh_at: Optional[float] = None
+        self.refresh_count = 0
+        self._inflight: Optional[asyncio.Future] = None
+
+    # --------------------------
+    # Token lifetime
+    # --------------------------
+    def record(self, response: Dict[str, Any]) -> None:
+        """Remember when the token returned by /auth/token should be refreshed."""
+        lifetime = self._lifetime(response)
+        if lifetime is None:
+            self.refresh_at = None
+            return
+        margin = min(lifetime * self.refresh_margin, self.max_refresh_margin)
+        self.refresh_at = time.monotonic() + lifetime - margin
+
+    def _lifetime(self, response: Dict[str, Any]) -> Optional[float]:
+        expires_in = response.get("expires_in")
+        if isinstance(expires_in, (int, float)) and expires_in > 0:
+            return float(expires_in)
+        exp = self._jwt_exp(response.get("access_token"))
+        if exp is not None:
+            return max(exp - time.time(), 0.0)
+        return None
+
+    @staticmethod
+    def _jwt_exp(token: Any) -> Optional[float]:
+        # The claim is only used as a hint; the signature is the server's business.
+        if not isinstance(token, str) or token.count(".") != 2:
+            return None
+        payload = token.split(".")[1]
+        try:
+            claims = json.loads(
+                base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+            )
+        except (ValueError, TypeError):
+            return None
+        exp = claims.get("exp") if isinstance(claims, dict) else None
+        return float(exp) if isinstance(exp, (int, float)) else None
+
+    @property
+    def can_refresh(self) -> bool:
+        return bool(self.client.username and self.client.password)
+
+    # --------------------------
+    # Refresh
+    # --------------------------
+    async def ensure_fresh(self) -> None:
+        """Refresh ahead of expiry so requests don't pay a 401 round trip."""
+        if (
+            self.refresh_at is not None
+            and self.client.auth_token
+            and self.can_refresh
+            and time.monotonic() >= self.refresh_at
+        ):
+            await self.refresh(self.client.auth_token)
+
+    async def refresh(self, stale_token: Optional[str]) -> None:
+        """
+        Obtain a new token unless the one the caller used was already replaced.
+        Every concurrent caller awaits the same login.
+        """
+        current = self.client.auth_token
+        if current and current != stale_token:
+            return
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._login())
+        # shield: a cancelled caller must not abort the login others wait on
+        await asyncio.shield(self._inflight)
+
+    async def _login(self) -> None:
+        self.client.logger.info("Token expiré, renouvellement...")
+        self.refresh_count += 1
+        started = time.perf_counter()
+        ok = False
+        try:
+            await self.client.auth.login(
+                username=self.client.username,
+                password=self.client.password,
+                expires_in=self.expires_in,
+            )
+            ok = True
+        finally:
+            self.client.events.emit(
+                "token_refresh",
+                family="auth",
+                duration=time.perf_counter() - started,
+                ok=ok,
+            )
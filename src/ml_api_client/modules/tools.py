@@ -1,9 +1,34 @@
+import asyncio
+import inspect
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
-__all__ = ["ToolRegistry", "ToolProperty", "ToolParams"]
+from .serialization import JSONCodec, get_codec
+from .ttl_cache import TTLCache, TTLCacheStats
+
+__all__ = [
+    "ToolRegistry",
+    "ToolProperty",
+    "ToolParams",
+    "ToolCachePolicy",
+    "ToolExecutorConfig",
+]
 
 
 # --------------------------
@@ -25,6 +50,73 @@ class ToolParams(BaseModel):
     additionalProperties: bool = False  # explicit and strict by default
 
 
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """
+    Result memoization of an idempotent tool (lookups, weather, search).
+
+    Results are keyed on the validated arguments (after params_model
+    coercion), by default their canonical JSON; `key` maps the arguments to
+    any hashable value instead. Concurrent identical calls share one run and
+    failed runs are not cached.
+    """
+
+    ttl: float = 60.0
+    max_entries: int = 256
+    key: Optional[Callable[[Dict[str, Any]], Hashable]] = None
+
+
+@dataclass(frozen=True)
+class ToolExecutorConfig:
+    """
+    Where and how a tool runs.
+
+    kind: "thread" or "process" pool dedicated to the tool (max_workers) for
+    sync functions; process pools need a picklable, module-level function.
+    max_concurrency bounds simultaneous runs (sync or async); a run exceeding
+    timeout seconds is cancelled and reported to the model as an error (a
+    sync function already running in a worker cannot be interrupted, only
+    abandoned: it keeps its max_concurrency slot until it returns).
+    """
+
+    kind: str = "thread"
+    max_workers: int = 4
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in ("thread", "process"):
+            raise ValueError("kind must be 'thread' or 'process'")
+        if self.max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if self.max_concurrency is not None and self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError("timeout must be > 0")
+
+
+def _takes_single_dict(func: Callable[..., Any], schema: Dict[str, Any]) -> bool:
+    # call convention resolved once: fn(**args) unless the schema declares
+    # properties and the function's only positional parameter is none of them
+    properties = schema.get("properties") or {}
+    if not properties:
+        return False
+    try:
+        parameters = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    if len(parameters) != 1:
+        return False
+    param = parameters[0]
+    if param.kind not in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+        return param.kind is param.VAR_POSITIONAL
+    return param.default is param.empty and param.name not in properties
+
+
+def _default_cache_key(args: Dict[str, Any]) -> str:
+    return json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+
+
 @dataclass
 class _ToolEntry:
     name: str
@@ -35,6 +127,22 @@ class _ToolEntry:
     params_schema: Optional[Dict[str, Any]] = None
     # Optional Pydantic model for runtime validation/coercion
     params_model: Optional[Type[BaseModel]] = None
+    # Compiled validator of params_model, built once at registration
+    validator: Optional[TypeAdapter] = None
+    # Labels selecting subsets of the tools payload (to_openai_tools(tags=...))
+    tags: FrozenSet[str] = frozenset()
+    # May start while the model is still streaming the rest of its turn
+    speculative: bool = True
+    # Result memoization (ToolCachePolicy)
+    cache: Optional[TTLCache] = None
+    cache_key: Callable[[Dict[str, Any]], Hashable] = _default_cache_key
+    # Resolved at registration (ToolExecutorConfig)
+    is_async: bool = False
+    pass_dict: bool = False
+    executor_config: Optional[ToolExecutorConfig] = None
+    executor: Optional[Executor] = None  # created on first use
+    semaphore: Optional[asyncio.Semaphore] = None
+    timeout: Optional[float] = None
 
 
 class ToolRegistry:
@@ -44,8 +152,14 @@ class ToolRegistry:
         tools.to_openai_tools()  -> for chat.completions tools=[]
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: int = 8) -> None:
         self._tools: Dict[str, _ToolEntry] = {}
+        # sync tools without their own executor share this pool rather than
+        # the event loop's default executor (DNS and the rest of the process)
+        self.max_workers = max_workers
+        self._shared_pool: Optional[ThreadPoolExecutor] = None
+        # tools payloads (lists and encoded bytes) per subset, reset on change
+        self._payloads: Dict[Tuple[Any, ...], Any] = {}
 
     # --------------------------
     # Registration
@@ -57,7 +171,25 @@ class ToolRegistry:
         params: Optional[Union[ToolParams, Dict[str, Any], Type[BaseModel]]] = None,
         description: Optional[str] = None,
         strict: Optional[bool] = True,
+        speculative: bool = True,
+        cache: Optional[ToolCachePolicy] = None,
+        executor: Optional[ToolExecutorConfig] = None,
+        tags: Optional[Iterable[str]] = None,
+        pass_dict: Optional[bool] = None,
     ) -> None:
+        """
+        speculative=False keeps a streamed call from starting before the
+        assistant turn has finished (tools with side effects, or whose call
+        should only happen once the whole turn is known).
+        cache memoizes results across calls and conversations (see
+        ToolCachePolicy); only use it for idempotent tools.
+        executor sets the pool, concurrency and timeout of the tool (see
+        ToolExecutorConfig).
+        tags label the tool so requests can send only a subset of the registry.
+        pass_dict=True calls func(args) with the arguments dict instead of
+        func(**args); left to None, that only happens when the schema declares
+        properties and func's single positional parameter is none of them.
+        """
         if not isinstance(name, str) or not name:
             raise ValueError("tool name must be a non-empty string")
 
@@ -78,6 +210,9 @@ class ToolRegistry:
                 "params must be ToolParams, dict schema, BaseModel subclass, or None"
             )
 
+        self._shutdown_entry(self._tools.get(name))
+        config = executor or ToolExecutorConfig()
+
         self._tools[name] = _ToolEntry(
             name=name,
             func=func,
@@ -85,7 +220,31 @@ class ToolRegistry:
             strict=strict,
             params_schema=schema,
             params_model=params_model,
+            validator=TypeAdapter(params_model) if params_model else None,
+            tags=frozenset(tags or ()),
+            speculative=speculative,
+            cache=TTLCache(cache.ttl, cache.max_entries) if cache else None,
+            cache_key=(cache.key if cache and cache.key else _default_cache_key),
+            is_async=inspect.iscoroutinefunction(func),
+            pass_dict=(
+                _takes_single_dict(func, schema) if pass_dict is None else pass_dict
+            ),
+            executor_config=executor,
+            semaphore=(
+                asyncio.Semaphore(config.max_concurrency)
+                if config.max_concurrency
+                else None
+            ),
+            timeout=config.timeout,
         )
+        self._payloads.clear()
+
+    def remove(self, name: str) -> None:
+        entry = self._tools.pop(name, None)
+        if entry is None:
+            raise KeyError(f"tool '{name}' not registered")
+        self._shutdown_entry(entry)
+        self._payloads.clear()
 
     # --------------------------
     # Introspection
@@ -101,6 +260,52 @@ class ToolRegistry:
     def list(self) -> List[str]:
         return list(self._tools.keys())
 
+    def executor_for(self, entry: _ToolEntry) -> Executor:
+        """Pool running a sync tool, created on first use."""
+        config = entry.executor_config
+        if config is None:
+            if self._shared_pool is None:
+                self._shared_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="tool"
+                )
+            return self._shared_pool
+        if entry.executor is None:
+            if config.kind == "process":
+                entry.executor = ProcessPoolExecutor(max_workers=config.max_workers)
+            else:
+                entry.executor = ThreadPoolExecutor(
+                    max_workers=config.max_workers,
+                    thread_name_prefix=f"tool-{entry.name}",
+                )
+        return entry.executor
+
+    def shutdown(self) -> None:
+        """Releases the worker pools; they are recreated on the next call."""
+        for entry in self._tools.values():
+            self._shutdown_entry(entry)
+        if self._shared_pool is not None:
+            self._shared_pool.shutdown(wait=False, cancel_futures=True)
+            self._shared_pool = None
+
+    @staticmethod
+    def _shutdown_entry(entry: Optional[_ToolEntry]) -> None:
+        if entry is not None and entry.executor is not None:
+            entry.executor.shutdown(wait=False, cancel_futures=True)
+            entry.executor = None
+
+    def cache_stats(self) -> Dict[str, TTLCacheStats]:
+        """Hits/misses/evictions (and hit_rate) of every cached tool."""
+        return {
+            name: entry.cache.stats
+            for name, entry in self._tools.items()
+            if entry.cache is not None
+        }
+
+    def clear_cache(self, name: Optional[str] = None) -> None:
+        for entry in self._tools.values() if name is None else [self.get(name)]:
+            if entry.cache is not None:
+                entry.cache.invalidate()
+
     # --------------------------
     # Schema helpers
     # --------------------------
@@ -155,7 +360,9 @@ class ToolRegistry:
     # --------------------------
     # Export for OpenAI Chat Completions
     # --------------------------
-    def to_openai_tools(self) -> List[Dict[str, Any]]:
+    def to_openai_tools(
+        self, tags: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Returns Chat Completions `tools` payload:
         [
@@ -169,17 +376,43 @@ class ToolRegistry:
             }
           }
         ]
+        With tags, only the tools carrying at least one of them. The tool
+        dicts are built once per subset and shared: treat them as read-only.
         """
-        tools_payload: List[Dict[str, Any]] = []
-        for entry in self._tools.values():
-            func_obj: Dict[str, Any] = {
-                "name": entry.name,
-                "description": entry.description or f"Callable tool '{entry.name}'.",
-                "parameters": entry.params_schema or self._empty_schema(),
-            }
-            # Include strict only if provided
-            if entry.strict is not None:
-                func_obj["strict"] = bool(entry.strict)
+        return list(self._subset(frozenset(tags) if tags else None))
 
-            tools_payload.append({"type": "function", "function": func_obj})
-        return tools_payload
+    def tools_json(
+        self,
+        tags: Optional[Iterable[str]] = None,
+        codec: Union[None, str, JSONCodec] = None,
+    ) -> bytes:
+        """to_openai_tools() encoded once per subset and codec."""
+        codec = get_codec(codec)
+        subset = frozenset(tags) if tags else None
+        key = ("json", codec.name, subset)
+        encoded = self._payloads.get(key)
+        if encoded is None:
+            encoded = self._payloads[key] = codec.dumps(self._subset(subset))
+        return encoded
+
+    def _subset(self, tags: Optional[FrozenSet[str]]) -> List[Dict[str, Any]]:
+        key = ("list", tags)
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = self._payloads[key] = [
+                self._tool_payload(entry)
+                for entry in self._tools.values()
+                if tags is None or entry.tags & tags
+            ]
+        return payload
+
+    def _tool_payload(self, entry: _ToolEntry) -> Dict[str, Any]:
+        func_obj: Dict[str, Any] = {
+            "name": entry.name,
+            "description": entry.description or f"Callable tool '{entry.name}'.",
+            "parameters": entry.params_schema or self._empty_schema(),
+        }
+        # Include strict only if provided
+        if entry.strict is not None:
+            func_obj["strict"] = bool(entry.strict)
+        return {"type": "function", "function": func_obj}
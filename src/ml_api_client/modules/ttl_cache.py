@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+__all__ = ["TTLCache", "TTLCacheStats"]
+
+
+@dataclass
+class TTLCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache:
+    """
+    Bounded async memoizer with per-entry expiry.
+
+    get_or_create() is single-flight: concurrent callers asking for the same
+    missing key share one call to the factory. Failed calls are not cached.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024) -> None:
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("ttl must be > 0 and max_entries >= 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = TTLCacheStats()
+        # key -> (expires_at, future resolving to the value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, asyncio.Future]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_create(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self.stats.hits += 1
+            self._entries.move_to_end(key)
+            return await asyncio.shield(entry[1])
+
+        self.stats.misses += 1
+        future = asyncio.ensure_future(factory())
+        self._entries[key] = (now + self.ttl, future)
+        self._entries.move_to_end(key)
+        self._evict(now)
+        future.add_done_callback(lambda f: self._forget_failed(key, f))
+        return await asyncio.shield(future)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: Tuple[Hashable, ...]) -> None:
+        """Drops the tuple keys starting with `prefix`."""
+        size = len(prefix)
+        stale = [
+            k for k in self._entries if isinstance(k, tuple) and k[:size] == prefix
+        ]
+        for k in stale:
+            del self._entries[k]
+
+    def _forget_failed(self, key: Hashable, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is future:
+                del self._entries[key]
+
+    def _evict(self, now: float) -> None:
+        if len(self._entries) <= self.max_entries:
+            return
+        expired = [k for k, (exp, _) in self._entries.items() if exp <= now]
+        for k in expired:
+            del self._entries[k]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
@@ -0,0 +1,92 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+__all__ = ["UsageCounters", "UsageTracker"]
+
+
+@dataclass
+class UsageCounters:
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+    def add(self, prompt: int, completion: int, total: int) -> None:
+        self.requests += 1
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+        self.total_tokens += total
+
+
+def _usage_numbers(usage: Any) -> Optional[Tuple[int, int, int]]:
+    # usage comes as an openai model (chat) or a plain dict (embeddings)
+    if usage is None:
+        return None
+    get = usage.get if isinstance(usage, dict) else lambda k: getattr(usage, k, None)
+    prompt = get("prompt_tokens") or 0
+    completion = get("completion_tokens") or 0
+    total = get("total_tokens") or prompt + completion
+    return prompt, completion, total
+
+
+class UsageTracker:
+    """
+    Token usage reported by the API, accumulated per kind ("chat",
+    "embeddings"), per model, per caller-supplied tag (e.g. a tenant) and per
+    tool-loop iteration of chat calls.
+
+    Counters are plain attributes updated in place, so a metrics exporter can
+    read them at any time without locks or copies; snapshot() returns a
+    detached dict.
+    """
+
+    def __init__(self) -> None:
+        self.chat = UsageCounters()
+        self.embeddings = UsageCounters()
+        self.by_model: Dict[str, UsageCounters] = {}
+        self.by_tag: Dict[str, UsageCounters] = {}
+        # 1-based tool-loop iteration of complete()/stream(auto_tool_execution=True)
+        self.by_iteration: Dict[int, UsageCounters] = {}
+
+    def record(
+        self,
+        kind: str,
+        model: Optional[str],
+        usage: Any,
+        tag: Optional[str] = None,
+        iteration: Optional[int] = None,
+    ) -> None:
+        numbers = _usage_numbers(usage)
+        if numbers is None:
+            return
+        getattr(self, kind).add(*numbers)
+        if model:
+            self._counters(self.by_model, model).add(*numbers)
+        if tag is not None:
+            self._counters(self.by_tag, tag).add(*numbers)
+        if iteration is not None:
+            self._counters(self.by_iteration, iteration).add(*numbers)
+
+    @staticmethod
+    def _counters(table: Dict[Any, UsageCounters], key: Any) -> UsageCounters:
+        counters = table.get(key)
+        if counters is None:
+            counters = table[key] = UsageCounters()
+        return counters
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "chat": asdict(self.chat),
+            "embeddings": asdict(self.embeddings),
+            "by_model": {k: asdict(v) for k, v in self.by_model.items()},
+            "by_tag": {k: asdict(v) for k, v in self.by_tag.items()},
+            "by_iteration": {k: asdict(v) for k, v in self.by_iteration.items()},
+        }
+
+    def reset(self) -> None:
+        # in place: exporters may hold references to the counters
+        for counters in (self.chat, self.embeddings):
+            counters.__init__()
+        self.by_model.clear()
+        self.by_tag.clear()
+        self.by_iteration.clear()
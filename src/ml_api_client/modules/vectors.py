@@ -0,0 +1,103 @@
+import base64
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from ..models import EmbeddingsUsage
+
+try:  # optional: contiguous matrices and vectorized math
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+__all__ = ["EmbeddingMatrix", "decode_vector", "HAS_NUMPY"]
+
+HAS_NUMPY = np is not None
+
+
+def decode_vector(embedding: Union[str, Sequence[float]]) -> array:
+    """Decodes one embedding (float list or base64 little-endian float32) to array('f')."""
+    vector = array("f")
+    if isinstance(embedding, str):
+        vector.frombytes(base64.b64decode(embedding))
+        if sys.byteorder == "big":
+            vector.byteswap()
+    else:
+        vector.extend(embedding)
+    return vector
+
+
+class EmbeddingMatrix:
+    """
+    Embeddings stored as one contiguous float32 matrix (n rows x dim).
+
+    `data` is a 2-D numpy array when numpy is installed, otherwise a flat
+    array('f') in row-major order. Row metadata (`indices`, `model`, `usage`)
+    is kept beside the matrix instead of in one pydantic object per vector.
+    """
+
+    def __init__(
+        self,
+        data: Any,
+        dim: int,
+        indices: List[int],
+        model: Optional[str] = None,
+        usage: Optional[EmbeddingsUsage] = None,
+    ) -> None:
+        self.data = data
+        self.dim = dim
+        self.indices = indices
+        self.model = model
+        self.usage = usage or EmbeddingsUsage()
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> "EmbeddingMatrix":
+        rows = sorted(response.get("data", []), key=lambda d: d["index"])
+        embeddings = [r["embedding"] for r in rows]
+        n = len(embeddings)
+
+        if embeddings and all(isinstance(e, str) for e in embeddings):
+            # base64 rows: one join, then a zero-copy view over the bytes
+            buf = b"".join(base64.b64decode(e) for e in embeddings)
+            dim = len(buf) // 4 // n
+            if np is not None:
+                data = np.frombuffer(buf, dtype="<f4").reshape(n, dim)
+            else:
+                data = array("f")
+                data.frombytes(buf)
+                if sys.byteorder == "big":
+                    data.byteswap()
+        else:
+            dim = len(embeddings[0]) if embeddings else 0
+            if np is not None:
+                data = np.asarray(embeddings, dtype=np.float32).reshape(n, dim)
+            else:
+                data = array("f")
+                for e in embeddings:
+                    data.extend(decode_vector(e))
+
+        return cls(
+            data=data,
+            dim=dim,
+            indices=[r["index"] for r in rows],
+            model=response.get("model"),
+            usage=EmbeddingsUsage(**(response.get("usage") or {})),
+        )
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def row(self, i: int) -> Any:
+        """Row `i` as a numpy view or an array('f') slice."""
+        if np is not None and isinstance(self.data, np.ndarray):
+            return self.data[i]
+        return self.data[i * self.dim : (i + 1) * self.dim]
+
+    def tolist(self) -> List[List[float]]:
+        if np is not None and isinstance(self.data, np.ndarray):
+            return self.data.tolist()
+        return [self.row(i).tolist() for i in range(len(self))]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self) * self.dim * 4
@@ -0,0 +1,97 @@
+from typing import AsyncIterable, AsyncIterator, Iterable, List, TypeVar, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+T = TypeVar("T")
+
+# Rough chars-per-token ratio used to size requests without a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Approximate token count of a text, from its length."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def as_async_iterable(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterable[T]:
+    """Lets sync and async iterables be consumed with `async for` alike."""
+    if isinstance(items, AsyncIterable):
+        return items
+
+    async def _aiter() -> AsyncIterator[T]:
+        for item in items:
+            yield item
+
+    return _aiter()
+
+
+def route_family(url: str) -> str:
+    """
+    Groups a request URL into its endpoint family: "chat", "embeddings",
+    "vector_stores", "models", "auth" or "default".
+    """
+    path = urlsplit(url).path
+    for family, marker in (
+        ("chat", "/chat/"),
+        ("embeddings", "/embeddings"),
+        ("vector_stores", "/vector_stores"),
+        ("models", "/models"),
+        ("auth", "/auth/"),
+    ):
+        if marker in path:
+            return family
+    return "default"
+
+
+async def iter_sse_data(stream: aiohttp.StreamReader) -> AsyncIterator[bytes]:
+    """
+    Yields the `data` payload of each server-sent event, as raw bytes.
+    Multi-line payloads are joined with newlines; other fields are ignored.
+    """
+    data: List[bytes] = []
+    async for raw in stream:
+        line = raw.rstrip(b"\r\n")
+        if not line:
+            # blank line terminates the event
+            if data:
+                yield b"\n".join(data)
+                data = []
+            continue
+        if line.startswith(b"data:"):
+            value = line[5:]
+            data.append(value[1:] if value.startswith(b" ") else value)
+    if data:
+        yield b"\n".join(data)
+
+
+async def iter_sse_frames(stream: aiohttp.StreamReader) -> AsyncIterator[bytes]:
+    """
+    Yields each server-sent event as its raw frame (fields and the trailing
+    blank line), without decoding it, so it can be relayed as is. CRLF line
+    endings are normalized to LF.
+    """
+    buffer = b""
+    async for block in stream.iter_any():
+        if b"\r" in block:
+            block = block.replace(b"\r\n", b"\n")
+        buffer = buffer + block if buffer else block
+        start = 0
+        while True:
+            end = buffer.find(b"\n\n", start)
+            if end < 0:
+                break
+            yield buffer[start : end + 2]
+            start = end + 2
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.rstrip(b"\n") + b"\n\n"
+
+
+def sse_frame_data(frame: bytes) -> bytes:
+    """The `data` payload of a raw SSE frame (multi-line data joined by LF)."""
+    return b"\n".join(
+        line[6:] if line.startswith(b"data: ") else line[5:]
+        for line in frame.split(b"\n")
+        if line.startswith(b"data:")
+    )
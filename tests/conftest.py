@@ -2,6 +2,7 @@ import os
 
 import pytest
 import pytest_asyncio
+from aiohttp import web
 from dotenv import load_dotenv
 
 from ml_api_client import APIClient
@@ -28,3 +29,24 @@ async def api_client(env_variables):
     )
     yield client
     await client.close()
+
+
+@pytest_asyncio.fixture
+async def local_api():
+    """Démarre des serveurs aiohttp locaux pour les tests hors ligne ; retourne leur URL de base."""
+    runners = []
+
+    async def start(routes: web.RouteTableDef) -> str:
+        app = web.Application()
+        app.add_routes(routes)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient, RateLimit
+from ml_api_client.models import EmbeddingsRequest
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight(local_api):
+    routes = web.RouteTableDef()
+    state = {"current": 0, "peak": 0}
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        state["current"] += 1
+        state["peak"] = max(state["peak"], state["current"])
+        await asyncio.sleep(0.01)
+        state["current"] -= 1
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key", max_in_flight=3) as client:
+        await asyncio.gather(*(client.models.list_models() for _ in range(12)))
+    assert state["peak"] == 3
+
+
+@pytest.mark.asyncio
+async def test_429_honours_retry_after(local_api):
+    routes = web.RouteTableDef()
+    hits = []
+
+    @routes.post("/v1/embeddings")
+    async def embeddings(request):
+        hits.append(time.monotonic())
+        if len(hits) == 1:
+            return web.json_response(
+                {"error": "slow down"}, status=429, headers={"Retry-After": "0.2"}
+            )
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    limits = {"embeddings": RateLimit(requests_per_second=50)}
+    async with APIClient(
+        base_url=base_url, api_key="key", rate_limits=limits
+    ) as client:
+        response = await client.embeddings.get_embeddings(
+            EmbeddingsRequest(input=["a"], model="m")
+        )
+        stats = client.admission.stats()["embeddings"]
+
+    assert response["data"] == []
+    assert hits[1] - hits[0] >= 0.2
+    assert stats["throttled"] == 1
+    # the request rate was halved after the 429
+    assert stats["requests_per_second"] < 50
+
+
+@pytest.mark.asyncio
+async def test_5xx_without_retry_after_does_not_pause_family(local_api):
+    routes = web.RouteTableDef()
+    hits = []
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        hits.append(time.monotonic())
+        if len(hits) == 1:
+            return web.json_response({"error": "busy"}, status=503)
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key", retry_delay=0.01) as client:
+        started = time.monotonic()
+        await client.models.list_models()
+        elapsed = time.monotonic() - started
+        stats = client.admission.stats()["models"]
+
+    assert len(hits) == 2
+    assert stats["paused_for"] == 0.0
+    # only the retry policy's short backoff, no family-wide pause
+    assert elapsed < 0.5
@@ -0,0 +1,623 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from pydantic import BaseModel
+
+from ml_api_client import APIClient, APIError, ToolCachePolicy
+from ml_api_client.models import EmbeddingsRequest
+from ml_api_client.modules.serialization import available_codecs
+
+
+def _completion(content):
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+def _chunk(content):
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "test-model",
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+    }
+
+
+async def _sse(request, chunks):
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await response.prepare(request)
+    for chunk in chunks:
+        await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+    await response.write(b"data: [DONE]\n\n")
+    return response
+
+
+@pytest.mark.asyncio
+async def test_complete_and_stream_share_session(local_api):
+    routes = web.RouteTableDef()
+    peers = set()
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        body = await request.json()
+        if body["stream"]:
+            return await _sse(request, [_chunk("he"), _chunk("llo")])
+        return web.json_response(_completion("hello"))
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        messages = [{"role": "user", "content": "hi"}]
+        resp = await client.chat.complete("test-model", messages)
+        assert resp.choices[0].message.content == "hello"
+
+        text = [t async for t in client.chat.stream_text("test-model", messages)]
+        assert "".join(text) == "hello"
+
+    # Both calls went over the same pooled connection
+    assert len(peers) == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_uses_rotated_token(local_api):
+    routes = web.RouteTableDef()
+    seen = []
+
+    @routes.post("/v1/auth/token")
+    async def token(request):
+        return web.json_response({"access_token": "fresh", "token_type": "bearer"})
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        seen.append(request.headers.get("Authorization"))
+        if request.headers.get("Authorization") != "Bearer fresh":
+            raise web.HTTPUnauthorized()
+        return await _sse(request, [_chunk("ok")])
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, username="u", password="p") as client:
+        client.retry_delay = 0
+        client.auth_token = "stale"
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "test-model", [{"role": "user", "content": "hi"}]
+            )
+        ]
+    assert text == ["ok"]
+    assert seen == ["Bearer stale", "Bearer fresh"]
+
+
+@pytest.mark.asyncio
+async def test_usage_is_accounted(local_api):
+    routes = web.RouteTableDef()
+    bodies = []
+    usage = {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        body = await request.json()
+        bodies.append(body)
+        if body["stream"]:
+            final = {**_chunk(None), "choices": [], "usage": usage}
+            return await _sse(request, [_chunk("ok"), final])
+        return web.json_response({**_completion("ok"), "usage": usage})
+
+    @routes.post("/v1/embeddings")
+    async def embeddings(request):
+        return web.json_response(
+            {
+                "object": "list",
+                "data": [{"object": "embedding", "embedding": [0.0], "index": 0}],
+                "usage": {"prompt_tokens": 3, "total_tokens": 3},
+            }
+        )
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        messages = [{"role": "user", "content": "hi"}]
+        await client.chat.complete("test-model", messages, usage_tag="tenant-a")
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "test-model", messages, usage_tag="tenant-b"
+            )
+        ]
+        await client.embeddings.get_embeddings(
+            EmbeddingsRequest(input=["a"], model="emb"), usage_tag="tenant-a"
+        )
+        usage_totals = client.usage
+
+    assert text == ["ok"]
+    assert bodies[1]["stream_options"] == {"include_usage": True}
+    assert usage_totals.chat.total_tokens == 14
+    assert usage_totals.chat.completion_tokens == 4
+    assert usage_totals.embeddings.prompt_tokens == 3
+    assert usage_totals.by_tag["tenant-a"].total_tokens == 10
+    assert usage_totals.by_tag["tenant-b"].requests == 1
+    assert usage_totals.by_model["emb"].total_tokens == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("explicit", [False, True])
+async def test_usage_only_chunk_hidden_unless_requested(local_api, explicit):
+    routes = web.RouteTableDef()
+    usage = {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        final = {**_chunk(None), "choices": [], "usage": usage}
+        return await _sse(request, [_chunk("ok"), final])
+
+    base_url = await local_api(routes)
+    kwargs = {"stream_options": {"include_usage": True}} if explicit else {}
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        chunks = [
+            c
+            async for c in client.chat.stream(
+                "test-model", [{"role": "user", "content": "hi"}], **kwargs
+            )
+        ]
+        total = client.usage.chat.total_tokens
+
+    assert [len(c.choices) for c in chunks] == ([1, 0] if explicit else [1])
+    assert total == 7
+
+
+@pytest.mark.asyncio
+async def test_stream_sse_passthrough_relays_raw_frames(local_api):
+    routes = web.RouteTableDef()
+    tool_chunk = {
+        **_chunk(None),
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"tool_calls": [{"index": 0, "function": {"name": "f"}}]},
+            }
+        ],
+    }
+    usage_chunk = {
+        **_chunk(None),
+        "choices": [],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3},
+    }
+    upstream = [_chunk("he"), _chunk("llo"), tool_chunk, usage_chunk]
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        return await _sse(request, upstream)
+
+    base_url = await local_api(routes)
+    tool_frames = []
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        frames = [
+            f
+            async for f in client.chat.stream_sse(
+                "test-model", [], passthrough=True, on_tool_call=tool_frames.append
+            )
+        ]
+        total = client.usage.chat.total_tokens
+
+    expected = [f"data: {json.dumps(c)}\n\n".encode() for c in upstream]
+    # the usage-only frame was requested by the client, so it is not relayed
+    assert frames == expected[:3] + [b"data: [DONE]\n\n"]
+    assert tool_frames == [expected[2]]
+    assert total == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_sse_passthrough_raises_on_error_frame(local_api):
+    routes = web.RouteTableDef()
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        return await _sse(request, [_chunk("a"), {"error": {"message": "boom"}}])
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        frames = []
+        with pytest.raises(APIError, match="boom"):
+            async for frame in client.chat.stream_sse("m", [], passthrough=True):
+                frames.append(frame)
+    assert len(frames) == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_text_raises_on_malformed_frame(local_api):
+    routes = web.RouteTableDef()
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(f"data: {json.dumps(_chunk('ok'))}\n\n".encode())
+        await response.write(b'data: {"choices": [\n\n')
+        return response
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        received = []
+        with pytest.raises(APIError, match="Malformed"):
+            async for text in client.chat.stream_text("m", []):
+                received.append(text)
+    assert received == ["ok"]
+
+
+def _tool_call_chunk(index, call_id=None, name=None, arguments=None):
+    function = {}
+    if name:
+        function["name"] = name
+    if arguments is not None:
+        function["arguments"] = arguments
+    call = {"index": index, "function": function}
+    if call_id:
+        call["id"] = call_id
+    return {
+        **_chunk(None),
+        "choices": [{"index": 0, "delta": {"tool_calls": [call]}}],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", available_codecs())
+async def test_tool_results_encoded_by_every_codec(local_api, codec):
+    routes = web.RouteTableDef()
+    turns = []
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        body = await request.json()
+        turns.append(body["messages"])
+        if len(turns) > 1:
+            return web.json_response(_completion("done"))
+        call = {
+            "id": "call_a",
+            "type": "function",
+            "function": {"name": "lookup", "arguments": "{}"},
+        }
+        completion = _completion(None)
+        completion["choices"][0]["message"]["tool_calls"] = [call]
+        completion["choices"][0]["finish_reason"] = "tool_calls"
+        return web.json_response(completion)
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key", json_codec=codec) as client:
+        client.tools.register("lookup", lambda: {1: "a", "b": [2.5, None]})
+        result = await client.chat.complete(
+            "m", [{"role": "user", "content": "?"}], auto_tool_execution=True
+        )
+
+    assert result.choices[0].message.content == "done"
+    tool_messages = [m for m in turns[1] if m["role"] == "tool"]
+    assert json.loads(tool_messages[0]["content"]) == {"1": "a", "b": [2.5, None]}
+
+
+@pytest.mark.asyncio
+async def test_stream_text_runs_streamed_tool_calls(local_api):
+    routes = web.RouteTableDef()
+    turns = []
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        body = await request.json()
+        turns.append(body["messages"])
+        if len(turns) == 1:
+            return await _sse(
+                request,
+                [
+                    _tool_call_chunk(0, "call_a", "add", '{"a": 1,'),
+                    _tool_call_chunk(1, "call_b", "add", '{"a": 10, "b": 20}'),
+                    _tool_call_chunk(0, arguments=' "b": 2}'),
+                ],
+            )
+        return await _sse(request, [_chunk("done")])
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.tools.register("add", lambda a, b: {"sum": a + b})
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "m", [{"role": "user", "content": "add"}], auto_tool_execution=True
+            )
+        ]
+
+    assert text == ["done"]
+    results = {
+        m["tool_call_id"]: json.loads(m["content"])
+        for m in turns[1]
+        if m["role"] == "tool"
+    }
+    assert results == {"call_a": {"sum": 3}, "call_b": {"sum": 30}}
+
+
+@pytest.mark.asyncio
+async def test_streamed_tool_arguments_validated_once(local_api):
+    class AddParams(BaseModel):
+        a: int
+        b: int
+
+    routes = web.RouteTableDef()
+    turns = []
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        body = await request.json()
+        turns.append(body["messages"])
+        if len(turns) == 1:
+            return await _sse(
+                request,
+                [
+                    _tool_call_chunk(0, "call_a", "add", '{"a": 1, '),
+                    _tool_call_chunk(0, arguments='"b": "x"}'),
+                    _tool_call_chunk(1, "call_b", "add", "{not json"),
+                ],
+            )
+        return await _sse(request, [_chunk("done")])
+
+    calls = []
+    events = []
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.events.add_listener(events.append)
+        client.tools.register("add", lambda a, b: calls.append((a, b)), AddParams)
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "m", [{"role": "user", "content": "add"}], auto_tool_execution=True
+            )
+        ]
+
+    assert text == ["done"] and calls == []
+    results = {m["tool_call_id"]: m["content"] for m in turns[1] if m["role"] == "tool"}
+    assert "Invalid arguments for tool 'add'" in results["call_a"]
+    assert "Invalid JSON arguments for tool 'add'" in results["call_b"]
+    assert [e.attributes["model"] for e in events if e.name == "validation"] == ["add"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_streamed_tool_reported_to_model(local_api):
+    routes = web.RouteTableDef()
+    turns = []
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        body = await request.json()
+        turns.append(body["messages"])
+        if len(turns) == 1:
+            return await _sse(
+                request, [_tool_call_chunk(0, "call_a", "missing", '{"q": "a"}')]
+            )
+        return await _sse(request, [_chunk("done")])
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.tools.register("lookup", lambda q: q, speculative=True)
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "m", [{"role": "user", "content": "?"}], auto_tool_execution=True
+            )
+        ]
+
+    assert text == ["done"]
+    results = [json.loads(m["content"]) for m in turns[1] if m["role"] == "tool"]
+    assert results == [{"error": "Unknown tool 'missing'"}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("speculative", [True, False])
+async def test_tools_start_while_turn_streams(local_api, speculative):
+    routes = web.RouteTableDef()
+    started = asyncio.Event()
+    seen_mid_turn = []
+    turns = 0
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        nonlocal turns
+        turns += 1
+        if turns > 1:
+            return await _sse(request, [_chunk("done")])
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        first = _tool_call_chunk(0, "call_a", "lookup", '{"q": "a"}')
+        await response.write(f"data: {json.dumps(first)}\n\n".encode())
+        try:
+            await asyncio.wait_for(started.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+        seen_mid_turn.append(started.is_set())
+        second = _tool_call_chunk(1, "call_b", "lookup", '{"q": "b"}')
+        await response.write(f"data: {json.dumps(second)}\n\ndata: [DONE]\n\n".encode())
+        return response
+
+    async def lookup(q):
+        started.set()
+        return q
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.tools.register("lookup", lookup, speculative=speculative)
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "m", [{"role": "user", "content": "?"}], auto_tool_execution=True
+            )
+        ]
+
+    assert text == ["done"]
+    assert seen_mid_turn == [speculative]
+
+
+@pytest.mark.asyncio
+async def test_speculative_tool_started_once(local_api):
+    routes = web.RouteTableDef()
+    turns = 0
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        nonlocal turns
+        turns += 1
+        if turns > 1:
+            return await _sse(request, [_chunk("done")])
+        # trailing deltas after the closing brace of the arguments
+        return await _sse(
+            request,
+            [
+                _tool_call_chunk(0, "call_a", "lookup", '{"q": "a"}'),
+                _tool_call_chunk(0, arguments=" "),
+                _tool_call_chunk(0, arguments="\n"),
+            ],
+        )
+
+    calls = []
+
+    async def lookup(q):
+        calls.append(q)
+        return q
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.tools.register("lookup", lookup, speculative=True)
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "m", [{"role": "user", "content": "?"}], auto_tool_execution=True
+            )
+        ]
+
+    assert text == ["done"]
+    assert calls == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_nameless_call_cancels_speculative_runs(local_api):
+    routes = web.RouteTableDef()
+
+    started = asyncio.Event()
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        first = _tool_call_chunk(0, "call_a", "lookup", '{"q": "a"}')
+        await response.write(f"data: {json.dumps(first)}\n\n".encode())
+        await asyncio.wait_for(started.wait(), 1)
+        # a second call whose name never arrives
+        second = _tool_call_chunk(1, "call_b", arguments='{"q": "b"}')
+        await response.write(f"data: {json.dumps(second)}\n\ndata: [DONE]\n\n".encode())
+        return response
+
+    cancelled = []
+
+    async def lookup(q):
+        started.set()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(q)
+            raise
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.tools.register("lookup", lookup)
+        with pytest.raises(RuntimeError, match="Missing function name"):
+            async for _ in client.chat.stream_text(
+                "m", [{"role": "user", "content": "?"}], auto_tool_execution=True
+            ):
+                pass
+        await asyncio.sleep(0)
+
+    assert started.is_set()
+    assert cancelled == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_tool_cache_memoizes_validated_arguments(local_api):
+    class CityParams(BaseModel):
+        city: str
+        units: str = "metric"
+
+    routes = web.RouteTableDef()
+    turns = 0
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        nonlocal turns
+        turns += 1
+        if turns % 2 == 0:
+            return await _sse(request, [_chunk("done")])
+        # the same call twice in one turn, then again in the next conversation
+        return await _sse(
+            request,
+            [
+                _tool_call_chunk(0, "call_a", "weather", '{"city": "Paris"}'),
+                _tool_call_chunk(
+                    1, "call_b", "weather", '{"units": "metric", "city": "Paris"}'
+                ),
+            ],
+        )
+
+    calls = []
+
+    async def weather(city, units):
+        calls.append(city)
+        await asyncio.sleep(0.01)
+        return {"city": city, "temp": 20}
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.tools.register(
+            "weather", weather, CityParams, cache=ToolCachePolicy(ttl=60)
+        )
+        for _ in range(2):
+            text = [
+                t
+                async for t in client.chat.stream_text(
+                    "m", [{"role": "user", "content": "?"}], auto_tool_execution=True
+                )
+            ]
+            assert text == ["done"]
+        stats = client.tools.cache_stats()["weather"]
+
+    assert calls == ["Paris"]
+    assert (stats.hits, stats.misses) == (3, 1)
+    assert stats.hit_rate == 0.75
+
+
+@pytest.mark.asyncio
+async def test_complete_sends_tagged_registry_tools(local_api):
+    routes = web.RouteTableDef()
+    sent = []
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        body = await request.json()
+        sent.append([t["function"]["name"] for t in body.get("tools", [])])
+        return web.json_response(_completion("ok"))
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.tools.register("weather", lambda city: city, tags=["geo"])
+        client.tools.register("search", lambda q: q, tags=["web"])
+        messages = [{"role": "user", "content": "?"}]
+        await client.chat.complete("m", messages, auto_tool_execution=True)
+        await client.chat.complete(
+            "m", messages, auto_tool_execution=True, tool_tags=["web"]
+        )
+
+    assert sent == [["weather", "search"], ["search"]]
@@ -0,0 +1,86 @@
+from itertools import pairwise
+
+from ml_api_client.modules.chunking import TextChunker
+
+
+def test_character_chunks_overlap():
+    text = " ".join(f"word{i:03d}" for i in range(200))
+    chunker = TextChunker(chunk_size=100, overlap=20)
+    chunks = list(chunker.chunk_text(text, source="inline"))
+
+    assert all(len(c.text) <= 100 for c in chunks)
+    assert [c.metadata["chunk_index"] for c in chunks] == list(range(len(chunks)))
+    assert chunks[0].metadata["source"] == "inline"
+    # consecutive chunks share their boundary words
+    for prev, nxt in pairwise(chunks):
+        assert prev.text.split()[-1] in nxt.text.split()[:3]
+    # nothing is lost
+    words = {w for c in chunks for w in c.text.split()}
+    assert words == set(text.split())
+
+
+def test_file_streaming_matches_in_memory(tmp_path):
+    text = "Lorem ipsum dolor sit amet. " * 500
+    path = tmp_path / "doc.txt"
+    path.write_text(text, encoding="utf-8")
+
+    chunker = TextChunker(mode="tokens", chunk_size=64, overlap=8, read_size=97)
+    from_file = [c.text for c in chunker.chunk_file(path)]
+    in_memory = [c.text for c in chunker.chunk_text(text)]
+    assert from_file == in_memory
+
+
+def test_sentence_chunks(tmp_path):
+    sentences = [f"Sentence number {i}." for i in range(7)]
+    chunker = TextChunker(mode="sentences", chunk_size=3, overlap=1, read_size=5)
+    path = tmp_path / "doc.txt"
+    path.write_text(" ".join(sentences), encoding="utf-8")
+
+    chunks = list(chunker.chunk_file(path))
+    assert [c.text for c in chunks] == [
+        " ".join(sentences[0:3]),
+        " ".join(sentences[2:5]),
+        " ".join(sentences[4:7]),
+    ]
+    assert [c.metadata["start_sentence"] for c in chunks] == [0, 2, 4]
+
+
+def test_process_pool(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"doc{i}.txt"
+        path.write_text(f"Document {i}. " * 50, encoding="utf-8")
+        paths.append(path)
+
+    chunker = TextChunker(chunk_size=120, overlap=10)
+    sequential = list(chunker.chunk_files(paths))
+    pooled = list(chunker.chunk_files(paths, max_workers=2))
+    assert pooled == sequential
+    assert pooled[0].metadata["source"] == str(paths[0])
+
+
+def test_sentences_without_terminators_are_bounded(tmp_path):
+    text = "no terminator here " * 2000
+    path = tmp_path / "log.txt"
+    path.write_text(text, encoding="utf-8")
+
+    chunker = TextChunker(
+        mode="sentences", chunk_size=2, overlap=0, read_size=64, max_sentence_chars=500
+    )
+    chunks = list(chunker.chunk_file(path))
+    assert len(chunks) == 38
+    assert all(len(c.text) <= 2 * 500 + 1 for c in chunks)
+    assert "".join(c.text.replace(" ", "") for c in chunks) == text.replace(" ", "")
+
+
+def test_large_overlap_with_long_words_keeps_advancing():
+    text = ("a" * 59 + " " + "b" * 45 + " ") * 3
+    chunks = list(TextChunker(chunk_size=100, overlap=80).chunk_text(text))
+
+    starts = [c.metadata["start_char"] for c in chunks]
+    assert all(nxt - prev >= 20 for prev, nxt in pairwise(starts))
+    assert len(chunks) <= len(text) // 20
+    # consecutive windows still leave no gap
+    for prev, nxt in pairwise(chunks):
+        end = prev.metadata["start_char"] + len(prev.text)
+        assert nxt.metadata["start_char"] <= end + 1
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import (
+    APIClient,
+    APIError,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    RetryPolicy,
+)
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers(local_api):
+    routes = web.RouteTableDef()
+    state = {"status": 500, "calls": 0}
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        state["calls"] += 1
+        if state["status"] != 200:
+            return web.json_response({"error": "down"}, status=state["status"])
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    changes = []
+    config = CircuitBreakerConfig(min_calls=4, open_for=0.05, half_open_probes=1)
+    async with APIClient(
+        base_url=base_url,
+        api_key="key",
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker=config,
+    ) as client:
+        client.circuit_breakers.add_listener(lambda *change: changes.append(change))
+        for _ in range(4):
+            with pytest.raises(APIError):
+                await client.models.list_models()
+
+        # open: no request reaches the server
+        with pytest.raises(CircuitOpenError):
+            await client.models.list_models()
+        assert state["calls"] == 4
+
+        # after open_for, a successful probe closes the breaker
+        await asyncio.sleep(0.06)
+        state["status"] = 200
+        await client.models.list_models()
+        stats = client.breaker_stats()
+
+    (name,) = stats
+    assert name.startswith("models@")
+    assert stats[name]["state"] == "closed"
+    assert stats[name]["rejected"] == 1
+    assert [c[1:] for c in changes] == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
@@ -0,0 +1,49 @@
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient, ConnectorConfig
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(local_api):
+    routes = web.RouteTableDef()
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    async with APIClient(
+        base_url=base_url, connector_config=ConnectorConfig(limit=4)
+    ) as client:
+        await client.models.list_models()
+        stats = client.pool_stats()
+        assert stats.limit == 4
+        assert stats.in_use == 0
+        assert stats.idle == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_connector(local_api):
+    routes = web.RouteTableDef()
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    config = ConnectorConfig(limit=8)
+    first = APIClient(base_url=base_url, connector_config=config, share_connector=True)
+    second = APIClient(base_url=base_url, connector_config=config, share_connector=True)
+
+    await first.models.list_models()
+    await second.models.list_models()
+    assert first._connector is second._connector
+    # The warm connection opened by the first client is reused by the second
+    assert second.pool_stats().idle == 1
+
+    connector = first._connector
+    await first.close()
+    assert not connector.closed
+    await second.close()
+    assert connector.closed
@@ -0,0 +1,182 @@
+import asyncio
+import base64
+import random
+import struct
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient
+from ml_api_client.models import EmbeddingsRequest
+
+
+def _embeddings_routes(calls):
+    routes = web.RouteTableDef()
+
+    @routes.post("/v1/embeddings")
+    async def embeddings(request):
+        body = await request.json()
+        calls.append(body["input"])
+        await asyncio.sleep(random.random() / 100)
+        # Shuffled on purpose: callers must rely on `index`
+        data = [
+            {"object": "embedding", "embedding": [float(len(t))], "index": i}
+            for i, t in enumerate(body["input"])
+        ]
+        random.shuffle(data)
+        return web.json_response(
+            {
+                "id": "emb-1",
+                "object": "list",
+                "model": body["model"],
+                "data": data,
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        )
+
+    return routes
+
+
+@pytest.mark.asyncio
+async def test_embed_many_order_and_batches(local_api):
+    calls = []
+    base_url = await local_api(_embeddings_routes(calls))
+    texts = ["x" * n for n in range(1, 51)]
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        results = [
+            d
+            async for d in client.embeddings.embed_many(
+                iter(texts), "test-model", batch_size=8, max_concurrency=3
+            )
+        ]
+
+    assert [d.index for d in results] == list(range(50))
+    assert [d.embedding[0] for d in results] == [float(len(t)) for t in texts]
+    assert max(len(c) for c in calls) == 8
+
+
+@pytest.mark.asyncio
+async def test_embed_many_token_budget(local_api):
+    calls = []
+    base_url = await local_api(_embeddings_routes(calls))
+    # ~101 estimated tokens each: two per batch under a 250 token budget
+    texts = ["y" * 400] * 6
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        results = [
+            d
+            async for d in client.embeddings.embed_many(
+                texts, "test-model", max_batch_tokens=250, ordered=False
+            )
+        ]
+
+    assert sorted(d.index for d in results) == list(range(6))
+    assert [len(c) for c in calls] == [2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_merges_concurrent_calls(local_api):
+    calls = []
+    base_url = await local_api(_embeddings_routes(calls))
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.embeddings.enable_coalescing(linger=0.01, max_batch_size=16)
+        requests = [
+            EmbeddingsRequest(input=["a" * (i + 1)], model="m1") for i in range(10)
+        ] + [EmbeddingsRequest(input=["b", "bb"], model="m2")]
+        responses = await asyncio.gather(
+            *(client.embeddings.get_embeddings(r) for r in requests)
+        )
+
+    assert sorted(len(c) for c in calls) == [2, 10]
+    for request, response in zip(requests, responses, strict=True):
+        assert [d["index"] for d in response["data"]] == list(range(len(request.input)))
+        assert [d["embedding"][0] for d in response["data"]] == [
+            float(len(t)) for t in request.input
+        ]
+
+
+@pytest.mark.asyncio
+async def test_cache_only_sends_misses(local_api, tmp_path):
+    calls = []
+    base_url = await local_api(_embeddings_routes(calls))
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        cache = client.embeddings.enable_cache(
+            max_entries=2, path=str(tmp_path / "emb.db")
+        )
+        await client.embeddings.get_embeddings(
+            EmbeddingsRequest(input=["a", "bb"], model="m")
+        )
+        response = await client.embeddings.get_embeddings(
+            EmbeddingsRequest(input=["ccc", "a", "ccc"], model="m")
+        )
+        assert calls == [["a", "bb"], ["ccc"]]
+        assert [d["embedding"][0] for d in response["data"]] == [3.0, 1.0, 3.0]
+
+        # "bb" was evicted from memory but is still on disk
+        results = [d async for d in client.embeddings.embed_many(["bb", "ccc"], "m")]
+        assert len(calls) == 2
+        assert [d.embedding[0] for d in results] == [2.0, 3.0]
+        assert cache.stats.evictions >= 1
+        assert cache.stats.disk_hits == 1
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_rejects_short_response(local_api):
+    routes = web.RouteTableDef()
+
+    @routes.post("/v1/embeddings")
+    async def embeddings(request):
+        # one embedding for two inputs
+        return web.json_response(
+            {
+                "object": "list",
+                "model": "m",
+                "data": [{"object": "embedding", "embedding": [1.0], "index": 0}],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        )
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        client.embeddings.enable_cache()
+        with pytest.raises(ValueError):
+            await client.embeddings.get_embeddings(
+                EmbeddingsRequest(input=["a", "b"], model="m")
+            )
+
+
+@pytest.mark.asyncio
+async def test_embeddings_matrix_base64(local_api):
+    routes = web.RouteTableDef()
+    vectors = [[0.5, 1.5, -2.0], [3.0, 0.0, 0.25]]
+
+    @routes.post("/v1/embeddings")
+    async def embeddings(request):
+        body = await request.json()
+        assert body["encoding_format"] == "base64"
+        data = [
+            {
+                "object": "embedding",
+                "embedding": base64.b64encode(struct.pack("<3f", *v)).decode(),
+                "index": i,
+            }
+            for i, v in reversed(list(enumerate(vectors)))
+        ]
+        return web.json_response(
+            {
+                "id": "emb-1",
+                "model": body["model"],
+                "data": data,
+                "usage": {"prompt_tokens": 2, "total_tokens": 2},
+            }
+        )
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        matrix = await client.embeddings.get_embeddings_matrix(
+            EmbeddingsRequest(input=["a", "b"], model="m")
+        )
+    assert len(matrix) == 2 and matrix.dim == 3
+    assert matrix.indices == [0, 1]
+    assert matrix.tolist() == vectors
+    assert matrix.usage.total_tokens == 2
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient, HedgeConfig
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged(local_api):
+    routes = web.RouteTableDef()
+    calls = []
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        calls.append(1)
+        # only the first request hits the slow replica
+        if len(calls) == 1:
+            await asyncio.sleep(1.0)
+        return web.json_response({"object": "list", "data": [len(calls)]})
+
+    base_url = await local_api(routes)
+    async with APIClient(
+        base_url=base_url, api_key="key", hedging=HedgeConfig(initial_delay=0.05)
+    ) as client:
+        started = time.monotonic()
+        response = await client.models.list_models()
+        elapsed = time.monotonic() - started
+        stats = client.hedger.stats
+
+    assert response["data"] == [2]
+    assert elapsed < 0.5
+    assert len(calls) == 2
+    assert (stats.hedged, stats.hedge_wins) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped_by_budget(local_api):
+    routes = web.RouteTableDef()
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        await asyncio.sleep(0.03)
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    config = HedgeConfig(initial_delay=0.001, min_samples=1000, budget_ratio=0.0)
+    async with APIClient(base_url=base_url, api_key="key", hedging=config) as client:
+        await asyncio.gather(*(client.models.list_models() for _ in range(5)))
+        stats = client.hedger.stats
+
+    # the reserve allows a single hedge, the rest are suppressed
+    assert stats.hedged == 1
+    assert stats.suppressed == 4
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient, RetryPolicy
+
+
+@pytest.mark.asyncio
+async def test_request_and_stream_events(local_api):
+    routes = web.RouteTableDef()
+    calls = []
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        calls.append(1)
+        if len(calls) == 1:
+            return web.json_response({"error": "busy"}, status=502)
+        return web.json_response({"object": "list", "data": []})
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for content in ("a", "b", "c"):
+            chunk = {
+                "id": "1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "m",
+                "choices": [{"index": 0, "delta": {"content": content}}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    base_url = await local_api(routes)
+    events = []
+    async with APIClient(
+        base_url=base_url,
+        api_key="key",
+        retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.001),
+    ) as client:
+        client.events.add_listener(events.append)
+        await client.models.list_models()
+        text = [t async for t in client.chat.stream_text("m", [])]
+
+    assert "".join(text) == "abc"
+    names = [e.name for e in events]
+    assert names[:3] == ["request", "retry", "request"]
+
+    first, _, second = events[:3]
+    assert (first.attributes["status"], first.attributes["attempt"]) == (502, 1)
+    assert second.attributes["attempt"] == 2
+    phases = second.attributes["phases"]
+    for phase in ("queue_wait", "ttfb", "body_read", "json_decode"):
+        assert phases[phase] >= 0
+    # the first attempt opened the pooled connection
+    assert "connection_create" in first.attributes["phases"]
+
+    (stream,) = [e for e in events if e.name == "stream"]
+    assert stream.attributes["chunks"] == 3
+    assert stream.attributes["ttft"] > 0
+    assert len(stream.attributes["gaps"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_listener_no_events(local_api):
+    routes = web.RouteTableDef()
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        return web.json_response({"object": "list", "data": []})
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        assert not client.events.enabled
+        await client.models.list_models()
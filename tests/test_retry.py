@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient, APIError, RetryBudget, RetryPolicy
+
+
+def _models_routes(statuses):
+    routes = web.RouteTableDef()
+    calls = []
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        calls.append(1)
+        status = statuses.pop(0) if statuses else 200
+        if status != 200:
+            return web.json_response({"error": "unavailable"}, status=status)
+        return web.json_response({"object": "list", "data": []})
+
+    return routes, calls
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_status(local_api):
+    routes, calls = _models_routes([503, 502])
+    base_url = await local_api(routes)
+    policy = RetryPolicy(base_delay=0.001, max_delay=0.01)
+    async with APIClient(
+        base_url=base_url, api_key="key", retry_policy=policy
+    ) as client:
+        response = await client.models.list_models()
+
+    assert response["data"] == []
+    assert len(calls) == 3
+    assert policy.stats.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_status_fails_fast(local_api):
+    routes, calls = _models_routes([400])
+    base_url = await local_api(routes)
+    policy = RetryPolicy(base_delay=0.001)
+    async with APIClient(
+        base_url=base_url, api_key="key", retry_policy=policy
+    ) as client:
+        with pytest.raises(APIError):
+            await client.models.list_models()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_retry_load(local_api):
+    routes, calls = _models_routes([503] * 100)
+    base_url = await local_api(routes)
+    policy = RetryPolicy(
+        base_delay=0.001, max_delay=0.001, budget=RetryBudget(ratio=0.25, reserve=1)
+    )
+    async with APIClient(
+        base_url=base_url, api_key="key", retry_policy=policy
+    ) as client:
+        for _ in range(10):
+            with pytest.raises(APIError):
+                await client.models.list_models()
+
+    # 10 requests earn two retries on top of the reserve, not 3 retries each
+    assert policy.stats.retries == 3
+    assert len(calls) == 13
+    assert policy.stats.denied > 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "status, idempotent, expected_calls",
+    [(500, None, 2), (500, False, 1), (429, False, 2), (500, True, 2)],
+)
+async def test_writes_only_replayed_when_safe(
+    local_api, status, idempotent, expected_calls
+):
+    routes = web.RouteTableDef()
+    calls = []
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        calls.append(1)
+        if len(calls) == 1:
+            return web.json_response({"error": "oops"}, status=status)
+        return web.json_response(
+            {
+                "id": "c",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "m",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "ok"},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+        )
+
+    base_url = await local_api(routes)
+    policy = RetryPolicy(base_delay=0.001, max_delay=0.01)
+    async with APIClient(
+        base_url=base_url, api_key="key", retry_policy=policy
+    ) as client:
+        messages = [{"role": "user", "content": "hi"}]
+        # None: chat completions are replayed by default
+        kwargs = {} if idempotent is None else {"idempotent": idempotent}
+        if expected_calls == 1:
+            with pytest.raises(APIError):
+                await client.chat.complete("m", messages, **kwargs)
+        else:
+            response = await client.chat.complete("m", messages, **kwargs)
+            assert response.choices[0].message.content == "ok"
+    assert len(calls) == expected_calls
+
+
+@pytest.mark.asyncio
+async def test_stream_open_retried_by_default(local_api):
+    routes = web.RouteTableDef()
+    calls = []
+
+    @routes.post("/v1/chat/completions")
+    async def completions(request):
+        calls.append(1)
+        if len(calls) == 1:
+            return web.json_response({"error": "oops"}, status=502)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunk = {
+            "id": "c",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "m",
+            "choices": [{"index": 0, "delta": {"content": "ok"}}],
+        }
+        await response.write(f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode())
+        return response
+
+    base_url = await local_api(routes)
+    policy = RetryPolicy(base_delay=0.001, max_delay=0.01)
+    async with APIClient(
+        base_url=base_url, api_key="key", retry_policy=policy
+    ) as client:
+        text = [
+            t
+            async for t in client.chat.stream_text(
+                "m", [{"role": "user", "content": "hi"}]
+            )
+        ]
+
+    assert text == ["ok"]
+    assert len(calls) == 2
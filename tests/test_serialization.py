@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient
+from ml_api_client.modules.serialization import (
+    JSONFragment,
+    JSONStreamBuffer,
+    available_codecs,
+    get_codec,
+)
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codecs_round_trip(name):
+    codec = get_codec(name)
+    payload = {"text": "déjà vu", "values": [0.5, 1, None], "nested": {"ok": True}}
+    encoded = codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert "déjà".encode() in encoded
+    assert codec.loads(encoded) == payload
+    assert codec.loads(encoded.decode()) == payload
+
+
+def test_unknown_codec():
+    with pytest.raises(ImportError):
+        get_codec("nope")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", available_codecs())
+async def test_client_uses_codec(local_api, name):
+    routes = web.RouteTableDef()
+    received = []
+
+    @routes.post("/v1/vector_stores")
+    async def create(request):
+        received.append((request.content_type, await request.json()))
+        return web.json_response({"id": "vs_1", "name": "é"})
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key", json_codec=name) as client:
+        assert client.json_codec.name == name
+        response = await client._request(
+            "POST", f"{base_url}/vector_stores", json={"name": "é"}
+        )
+
+    assert response == {"id": "vs_1", "name": "é"}
+    assert received == [("application/json", {"name": "é"})]
+
+
+def test_stream_buffer_detects_completion():
+    document = '{"q": "a \\"}\\\\", "tags": ["{", "]"], "n": {"x": 1}}'
+    # every split point, including inside escapes and strings
+    for cut in range(1, len(document)):
+        buf = JSONStreamBuffer()
+        assert not buf.feed(document[:cut])
+        assert buf.feed(document[cut:])
+        assert json.loads(buf.text()) == json.loads(document)
+
+    buf = JSONStreamBuffer()
+    for char in document:
+        buf.feed(char)
+    assert buf.complete and buf.text() == document
+
+
+def test_stream_buffer_incomplete():
+    buf = JSONStreamBuffer()
+    assert not buf.feed('{"a": "}"')
+    assert not buf.complete
+    assert buf.text() == '{"a": "}"'
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_dumps_body_splices_fragments(name):
+    codec = get_codec(name)
+    fragment = JSONFragment(b'[{"type":"function"}]')
+    body = codec.dumps_body({"model": "m", "tools": fragment, "stream": False})
+    assert json.loads(body) == {
+        "model": "m",
+        "stream": False,
+        "tools": [{"type": "function"}],
+    }
+    assert json.loads(codec.dumps_body({"tools": fragment})) == {
+        "tools": [{"type": "function"}]
+    }
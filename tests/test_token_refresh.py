@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient
+
+
+def _auth_routes(logins, expires_in=3600):
+    routes = web.RouteTableDef()
+
+    @routes.post("/v1/auth/token")
+    async def token(request):
+        logins.append(1)
+        await asyncio.sleep(0.01)
+        return web.json_response(
+            {
+                "access_token": f"token-{len(logins)}",
+                "token_type": "bearer",
+                "expires_in": expires_in,
+            }
+        )
+
+    @routes.get("/v1/models/")
+    async def models(request):
+        if request.headers.get("Authorization") != f"Bearer token-{len(logins)}":
+            raise web.HTTPUnauthorized()
+        return web.json_response({"object": "list", "data": []})
+
+    return routes
+
+
+@pytest.mark.asyncio
+async def test_concurrent_401_single_login(local_api):
+    logins = []
+    base_url = await local_api(_auth_routes(logins))
+    async with APIClient(base_url=base_url, username="u", password="p") as client:
+        client.auth_token = "expired"
+        results = await asyncio.gather(
+            *(client.models.list_models() for _ in range(20))
+        )
+    assert all("data" in r for r in results)
+    assert len(logins) == 1
+
+
+@pytest.mark.asyncio
+async def test_proactive_refresh(local_api):
+    logins = []
+    # The token is already past its refresh point on the next request
+    base_url = await local_api(_auth_routes(logins, expires_in=0.001))
+    async with APIClient(base_url=base_url, username="u", password="p") as client:
+        await client.auth.login()
+        await asyncio.sleep(0.01)
+        await client.models.list_models()
+    assert len(logins) == 2
+    assert client.token_refresher.refresh_count == 1
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import pytest_asyncio
+
+from ml_api_client import APIClient, ToolExecutorConfig
+
+
+@pytest_asyncio.fixture
+async def chat():
+    client = APIClient(base_url="http://127.0.0.1:1/v1", api_key="key")
+    yield client.chat
+    await client.close()
+
+
+def test_call_convention_resolved_at_registration():
+    client = APIClient(base_url="http://127.0.0.1:1/v1", api_key="key")
+    tools = client.tools
+    tools.register("kwargs", lambda a, b: None, {"properties": {"a": {}, "b": {}}})
+    tools.register("named", lambda city: None, {"properties": {"city": {}}})
+    tools.register("payload", lambda args: None, {"properties": {"city": {}}})
+    tools.register("varkw", lambda **kw: None)
+    tools.register("schemaless", lambda city: None)
+    tools.register("explicit", lambda args: None, pass_dict=True)
+    assert [tools.get(n).pass_dict for n in tools.list()] == [
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_type_error_inside_tool_is_not_retried(chat):
+    calls = []
+
+    def broken(city):
+        calls.append(city)
+        raise TypeError("bug inside the tool")
+
+    chat.tools.register("broken", broken, {"properties": {"city": {}}})
+    result = await chat._maybe_call_tool("broken", '{"city": "Paris"}')
+    assert calls == ["Paris"]
+    assert result == {"error": "Tool 'broken' failed: bug inside the tool"}
+
+    chat.tools.register("payload", lambda args: args["city"], pass_dict=True)
+    assert await chat._maybe_call_tool("payload", '{"city": "Lyon"}') == "Lyon"
+
+
+@pytest.mark.asyncio
+async def test_schemaless_tool_receives_keyword_arguments(chat):
+    def lookup(city):
+        return city
+
+    chat.tools.register("lookup", lookup)
+    assert await chat._maybe_call_tool("lookup", '{"city": "Paris"}') == "Paris"
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_use_dedicated_pools(chat):
+    def thread_name():
+        return threading.current_thread().name
+
+    chat.tools.register("shared", thread_name)
+    chat.tools.register("own", thread_name, executor=ToolExecutorConfig())
+    assert (await chat._maybe_call_tool("shared", "")).startswith("tool_")
+    assert (await chat._maybe_call_tool("own", "")).startswith("tool-own")
+
+
+@pytest.mark.asyncio
+async def test_tool_timeout(chat):
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    chat.tools.register("slow", slow, executor=ToolExecutorConfig(timeout=0.05))
+    result = await chat._maybe_call_tool("slow", "")
+    assert result == {"error": "Tool 'slow' timed out after 0.05s"}
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_tool_max_concurrency(chat):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(n):
+        with lock:
+            running.append(n)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(n)
+        return n
+
+    chat.tools.register(
+        "work",
+        work,
+        {"properties": {"n": {}}},
+        executor=ToolExecutorConfig(max_workers=4, max_concurrency=2),
+    )
+    results = await asyncio.gather(
+        *(chat._maybe_call_tool("work", {"n": n}) for n in range(6))
+    )
+    assert results == list(range(6))
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_timed_out_sync_run_keeps_its_slot(chat):
+    release = threading.Event()
+    started = []
+
+    def block(n):
+        started.append(n)
+        release.wait(2)
+        return n
+
+    chat.tools.register(
+        "block",
+        block,
+        {"properties": {"n": {}}},
+        executor=ToolExecutorConfig(max_concurrency=1, timeout=0.05),
+    )
+    result = await chat._maybe_call_tool("block", {"n": 1})
+    assert result == {"error": "Tool 'block' timed out after 0.05s"}
+
+    # the abandoned run still holds the only slot
+    second = asyncio.ensure_future(chat._maybe_call_tool("block", {"n": 2}))
+    await asyncio.sleep(0.1)
+    assert started == [1]
+    release.set()
+    assert await second == 2
+    assert started == [1, 2]
+
+
+def test_executor_config_validation():
+    with pytest.raises(ValueError):
+        ToolExecutorConfig(kind="fiber")
+    with pytest.raises(ValueError):
+        ToolExecutorConfig(timeout=0)
+
+
+def test_tools_payload_cached_per_subset():
+    tools = APIClient(base_url="http://127.0.0.1:1/v1", api_key="key").tools
+    tools.register("weather", lambda city: city, tags=["geo"])
+    tools.register("search", lambda q: q, tags=["web"])
+
+    encoded = tools.tools_json()
+    assert tools.tools_json() is encoded
+    assert [t["function"]["name"] for t in json.loads(encoded)] == [
+        "weather",
+        "search",
+    ]
+    geo = tools.tools_json(tags=["geo"])
+    assert [t["function"]["name"] for t in json.loads(geo)] == ["weather"]
+    assert tools.to_openai_tools(tags={"web"})[0]["function"]["name"] == "search"
+
+    tools.remove("weather")
+    assert json.loads(tools.tools_json(tags=["geo"])) == []
+    tools.register("maps", lambda q: q, tags=["geo"])
+    assert tools.tools_json() is not encoded
+    assert len(json.loads(tools.tools_json())) == 2
+    with pytest.raises(KeyError):
+        tools.remove("weather")
@@ -0,0 +1,277 @@
+import base64
+import struct
+
+import pytest
+from aiohttp import web
+
+from ml_api_client import APIClient
+from ml_api_client.exceptions import APIError
+from ml_api_client.models import (
+    CreateVectorStoreRequest,
+    UpdateVectorStoreRequest,
+    VectorStoreSearchRequest,
+)
+from ml_api_client.modules.local_index import LocalVectorIndex
+
+
+def _store_routes(received, fail):
+    routes = web.RouteTableDef()
+
+    @routes.put("/v1/vector_stores/{store_id}")
+    async def update(request):
+        body = await request.json()
+        first = body["chunks"][0]
+        if fail(first):
+            raise web.HTTPServiceUnavailable()
+        received.append(body["chunks"])
+        return web.json_response(
+            {"success": True, "message": "ok", "chunks_added": len(body["chunks"])}
+        )
+
+    return routes
+
+
+@pytest.mark.asyncio
+async def test_ingest_retries_failed_batch_only(local_api):
+    received = []
+    failures = {"chunk-4": 1}
+
+    def fail(first):
+        if failures.get(first):
+            failures[first] -= 1
+            return True
+        return False
+
+    base_url = await local_api(_store_routes(received, fail))
+    progress = []
+    chunks = ((f"chunk-{i}", {"source": "doc", "position": i}) for i in range(10))
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        result = await client.vector_stores.ingest(
+            "vs_1",
+            chunks,
+            max_batch_chunks=4,
+            on_progress=lambda r: progress.append(r.chunks_added),
+        )
+
+    assert result.chunks_added == 10
+    assert result.batches_done == 3
+    assert result.retries == 1
+    # every batch landed exactly once
+    assert sorted(c for batch in received for c in batch) == sorted(
+        f"chunk-{i}" for i in range(10)
+    )
+    assert progress[-1] == 10
+
+
+@pytest.mark.asyncio
+async def test_ingest_resumes_from_checkpoint(local_api, tmp_path):
+    received = []
+    down = {"value": True}
+    base_url = await local_api(
+        _store_routes(received, lambda first: down["value"] and first == "c-4")
+    )
+    path = str(tmp_path / "ingest.json")
+    texts = [f"c-{i}" for i in range(10)]
+
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        with pytest.raises(APIError):
+            await client.vector_stores.ingest(
+                "vs_1", texts, max_batch_chunks=4, max_attempts=2, checkpoint=path
+            )
+        sent_before = sum(len(b) for b in received)
+
+        down["value"] = False
+        result = await client.vector_stores.ingest(
+            "vs_1", texts, max_batch_chunks=4, checkpoint=path
+        )
+
+    assert result.batches_skipped == 2
+    assert result.chunks_added == 10
+    assert sent_before == 6
+    assert received[-1] == ["c-4", "c-5", "c-6", "c-7"]
+
+
+@pytest.mark.asyncio
+async def test_search_many_fuses_and_caches(local_api):
+    routes = web.RouteTableDef()
+    calls = []
+    results = {
+        ("vs_a", "q1"): [{"id": "1", "score": 0.9}, {"id": "2", "score": 0.5}],
+        ("vs_a", "q2"): [{"id": "2", "score": 0.8}, {"id": "3", "score": 0.7}],
+        ("vs_b", "q1"): [{"id": "1", "score": 0.6}],
+    }
+
+    @routes.post("/v1/vector_stores/{store_id}/search")
+    async def search(request):
+        store_id = request.match_info["store_id"]
+        body = await request.json()
+        calls.append((store_id, body["query"]))
+        return web.json_response({"data": results[(store_id, body["query"])]})
+
+    base_url = await local_api(routes)
+    searches = [("vs_a", "q1"), ("vs_a", "q2"), ("vs_b", "q1")]
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        fused = await client.vector_stores.search_many(searches)
+        by_score = await client.vector_stores.search_many(searches, ranking="score")
+
+    # "2" is found by two queries of vs_a and wins under RRF
+    assert [(h["vector_store_id"], h["id"]) for h in fused] == [
+        ("vs_a", "2"),
+        ("vs_a", "1"),
+        ("vs_b", "1"),
+        ("vs_a", "3"),
+    ]
+    assert fused[0]["queries"] == ["q1", "q2"]
+    assert [h["fused_score"] for h in by_score] == [0.9, 0.8, 0.7, 0.6]
+    # the second fan-out was served from the cache
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_writes_drop_cached_searches_of_the_store(local_api):
+    routes = web.RouteTableDef()
+    calls = []
+
+    @routes.post("/v1/vector_stores/{store_id}/search")
+    async def search(request):
+        calls.append(request.match_info["store_id"])
+        return web.json_response({"data": [{"id": str(len(calls)), "score": 1.0}]})
+
+    @routes.put("/v1/vector_stores/{store_id}")
+    async def update(request):
+        return web.json_response({"id": request.match_info["store_id"]})
+
+    base_url = await local_api(routes)
+    searches = [("vs_a", "q"), ("vs_b", "q")]
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        await client.vector_stores.search_many(searches)
+        await client.vector_stores.update_vector_store(
+            "vs_a", UpdateVectorStoreRequest(chunks=["new"])
+        )
+        hits = await client.vector_stores.search_many(searches)
+
+    # only vs_a is searched again, and its fresh result is returned
+    assert calls == ["vs_a", "vs_b", "vs_a"]
+    assert {(h["vector_store_id"], h["id"]) for h in hits} == {
+        ("vs_a", "3"),
+        ("vs_b", "2"),
+    }
+
+
+VECTORS = {
+    "cats purr": [1.0, 0.0, 0.0],
+    "dogs bark": [0.0, 1.0, 0.0],
+    "fish swim": [0.0, 0.0, 1.0],
+    "kittens": [0.9, 0.1, 0.0],
+}
+
+
+@pytest.mark.asyncio
+async def test_local_replica_search_and_fallback(local_api, tmp_path):
+    pytest.importorskip("numpy")
+    routes = web.RouteTableDef()
+    server_searches = []
+
+    @routes.post("/v1/embeddings")
+    async def embeddings(request):
+        body = await request.json()
+        data = []
+        for i, text in enumerate(body["input"]):
+            vector = VECTORS[text]
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(struct.pack("<3f", *vector)).decode()
+            data.append({"object": "embedding", "embedding": vector, "index": i})
+        return web.json_response({"id": "e", "model": body["model"], "data": data})
+
+    @routes.post("/v1/vector_stores/{store_id}/search")
+    async def search(request):
+        server_searches.append((await request.json())["query"])
+        return web.json_response({"data": []})
+
+    @routes.put("/v1/vector_stores/{store_id}")
+    async def update(request):
+        return web.json_response({"success": True, "message": "ok", "chunks_added": 1})
+
+    base_url = await local_api(routes)
+    chunks = [("cats purr", {"n": 0}), ("dogs bark", {"n": 1}), "fish swim"]
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        index = LocalVectorIndex.from_create_request(
+            client,
+            "vs_1",
+            CreateVectorStoreRequest(name="pets", embedding_model="emb"),
+            path=str(tmp_path / "vs_1.f32"),
+        )
+        await index.build(chunks)
+        client.vector_stores.attach_replica(index)
+
+        request = VectorStoreSearchRequest(query="kittens", limit=2)
+        local = await client.vector_stores.search_vector_store("vs_1", request)
+        assert [h["text"] for h in local["data"]] == ["cats purr", "dogs bark"]
+        assert local["data"][0]["metadata"] == {"n": 0}
+        assert server_searches == []
+
+        # a write through the client makes the replica stale
+        await client.vector_stores.update_vector_store(
+            "vs_1", UpdateVectorStoreRequest(chunks=["new"], metadata=[{}])
+        )
+        await client.vector_stores.search_vector_store("vs_1", request)
+        assert server_searches == ["kittens"]
+
+        reloaded = LocalVectorIndex.load(client, "vs_1", str(tmp_path / "vs_1.f32"))
+        euclid = LocalVectorIndex(client, "vs_2", "emb", distance="Euclidean")
+        await euclid.build(chunks)
+        for replica in (reloaded, euclid):
+            hits = replica.search_vector(VECTORS["kittens"], limit=1)["data"]
+            assert hits[0]["text"] == "cats purr"
+
+
+@pytest.mark.asyncio
+async def test_local_replica_query_cache_and_embedding_fallback(local_api):
+    pytest.importorskip("numpy")
+    routes = web.RouteTableDef()
+    embedded = []
+    server_searches = []
+
+    @routes.post("/v1/embeddings")
+    async def embeddings(request):
+        body = await request.json()
+        embedded.append(body["input"])
+        if body["input"] == ["unknown"]:
+            raise web.HTTPBadRequest()
+        data = [
+            {"object": "embedding", "embedding": VECTORS[t], "index": i}
+            for i, t in enumerate(body["input"])
+        ]
+        return web.json_response({"id": "e", "model": body["model"], "data": data})
+
+    @routes.post("/v1/vector_stores/{store_id}/search")
+    async def search(request):
+        server_searches.append((await request.json())["query"])
+        return web.json_response({"data": []})
+
+    base_url = await local_api(routes)
+    async with APIClient(base_url=base_url, api_key="key") as client:
+        index = LocalVectorIndex(client, "vs_1", "emb")
+        await index.build(["cats purr", "dogs bark"])
+        client.vector_stores.attach_replica(index)
+        embedded.clear()
+
+        request = VectorStoreSearchRequest(query="kittens", limit=1)
+        for _ in range(3):
+            hits = await client.vector_stores.search_vector_store("vs_1", request)
+            assert hits["data"][0]["text"] == "cats purr"
+        assert embedded == [["kittens"]]
+
+        by_vector = await client.vector_stores.search_vector_store(
+            "vs_1",
+            VectorStoreSearchRequest(query="?", limit=1),
+            query_vector=VECTORS["dogs bark"],
+        )
+        assert by_vector["data"][0]["text"] == "dogs bark"
+        assert len(embedded) == 1
+
+        failing = VectorStoreSearchRequest(query="unknown", limit=1)
+        assert await client.vector_stores.search_vector_store("vs_1", failing) == {
+            "data": []
+        }
+        assert server_searches == ["unknown"]